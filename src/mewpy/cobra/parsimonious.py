@@ -15,8 +15,10 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 from math import inf
+import numpy as np
 from mewpy.solvers import solver_instance
-from mewpy.simulation import get_simulator, SStatus
+from mewpy.solvers.solution import Status
+from mewpy.simulation import get_simulator
 
 
 def pFBA(model, objective=None, reactions=None, constraints=None, obj_frac=None):
@@ -56,37 +58,37 @@ def pFBA(model, objective=None, reactions=None, constraints=None, obj_frac=None)
     constraints.update(sim.environmental_conditions)
     # constraints.update(sim._constraints)
 
-    # make irreversible
-    for r_id in sim.reactions:
-        lb, _ = sim.get_reaction_bounds(r_id)
-        if lb < 0:
-            pos, neg = r_id + '_p', r_id + '_n'
-            solver.add_variable(pos, 0, inf, update=False)
-            solver.add_variable(neg, 0, inf, update=False)
-    solver.update()
+    # the objective value is computed on the same solver before splitting the reactions,
+    # so that the problem is built once and the pFBA problem starts from the basis of this solution
+    pre_solution = solver.solve(objective, minimize=False, constraints=constraints, get_values=False)
 
-    for r_id in sim.reactions:
-        lb, _ = sim.get_reaction_bounds(r_id)
-        if lb < 0:
-            pos, neg = r_id + '_p', r_id + '_n'
-            solver.add_constraint(
-                'c' + pos, {r_id: -1, pos: 1}, '>', 0, update=False)
-            solver.add_constraint(
-                'c' + neg, {r_id: 1, neg: 1}, '>', 0, update=False)
+    if pre_solution.status != Status.OPTIMAL:
+        return pre_solution
 
-    solver.update()
+    # make irreversible
+    # the bounds are read at once and the split variables and constraints are added in a single call each
+    rxn_ids = sim.reactions
+    lbs, _ = sim.get_reaction_bounds_array()
+    reversible = [rxn_ids[i] for i in np.flatnonzero(lbs < 0)]
+
+    var_ids, constr_ids, lhs = [], [], []
+    for r_id in reversible:
+        pos, neg = r_id + '_p', r_id + '_n'
+        var_ids.extend([pos, neg])
+        constr_ids.extend(['c' + pos, 'c' + neg])
+        lhs.extend([{r_id: -1, pos: 1}, {r_id: 1, neg: 1}])
+
+    # models without reversible reactions (e.g. irreversible models) do not need the split
+    if reversible:
+        solver.add_variables(var_ids, [0] * len(var_ids), [inf] * len(var_ids))
+        solver.add_constraints(constr_ids, lhs, ['>'] * len(constr_ids), [0] * len(constr_ids))
 
     # add biomass constraint
-    pre_solution = sim.simulate(constraints=constraints)
-
-    if pre_solution.status != SStatus.OPTIMAL:
-        return pre_solution
-
     if obj_frac is None:
-        solver.add_constraint('obj', objective, '=', pre_solution.objective_value)
+        solver.add_constraint('obj', objective, '=', pre_solution.fobj)
     else:
         solver.add_constraint('obj', objective, '>',
-                              obj_frac * pre_solution.objective_value)
+                              obj_frac * pre_solution.fobj)
 
     solver.update()
 
@@ -104,9 +106,9 @@ def pFBA(model, objective=None, reactions=None, constraints=None, obj_frac=None)
         for k, v in reactions.items():
             sobjective[f"{sim.protein_prefix}{k}"] = v
     else:
+        reversible = set(reversible)
         for r_id in reactions:
-            lb, _ = sim.get_reaction_bounds(r_id)
-            if lb < 0:
+            if r_id in reversible:
                 pos, neg = r_id + '_p', r_id + '_n'
                 sobjective[pos] = 1
                 sobjective[neg] = 1
@@ -29,6 +29,7 @@ from mewpy.util.parsing import build_tree, Boolean
 from mewpy.util import AttrDict
 from copy import deepcopy
 from warnings import warn
+import numpy as np
 from numpy import inf
 from tqdm import tqdm
 from typing import Dict, List, Union, TYPE_CHECKING
@@ -86,6 +87,7 @@ class CommunityModel:
         self.ext_mets = None
 
         self._reverse_map = None
+        self._exchange_table = None
         if abundances and any(e <= 0 for e in abundances):
             raise ValueError("All abundances need to be positive")
 
@@ -133,6 +135,7 @@ class CommunityModel:
         self.gene_map = None
         self.ext_mets = None
         self._reverse_map = None
+        self._exchange_table = None
         self._comm_model = None
 
     @property
@@ -183,8 +186,40 @@ class CommunityModel:
             self._reverse_map.update({v: k for k, v in self.gene_map.items()})
             return self._reverse_map
 
-    def get_organisms_biomass(self):
-        return self.organisms_biomass
+    @property
+    def exchange_table(self):
+        """Organism exchange stoichiometry of the external metabolites, in CSR layout.
+
+        Row i is the pair (org_id, m_id) in `rows`. Its entries are the community
+        reactions `columns[indptr[i]:indptr[i+1]]` with the stoichiometric coefficients
+        `coefficients[indptr[i]:indptr[i+1]]` of m_id in the organism reactions.
+
+        :returns: A tuple (rows, columns, coefficients, indptr).
+        """
+        if self._exchange_table is None:
+            reaction_map = self.reaction_map
+            # metabolite -> {reaction: coefficient} adjacency of each organism, built once
+            lookups = {org_id: organism.metabolite_reaction_lookup()
+                       for org_id, organism in self.organisms.items()}
+            rows, columns, coefficients, indptr = [], [], [], [0]
+            for m_id in self.merged_model.get_external_metabolites():
+                for org_id, lookup in lookups.items():
+                    reactions = lookup.get(m_id)
+                    if not reactions:
+                        continue
+                    n = len(columns)
+                    for r_id, coeff in reactions.items():
+                        new_id = reaction_map.get((org_id, r_id))
+                        if new_id is not None:
+                            columns.append(new_id)
+                            coefficients.append(coeff)
+                    if len(columns) > n:
+                        rows.append((org_id, m_id))
+                        indptr.append(len(columns))
+            self._exchange_table = (rows, columns,
+                                    np.array(coefficients, dtype=float),
+                                    np.array(indptr, dtype=int))
+        return self._exchange_table
 
     def set_abundance(self, abundances: Dict[str, float], rebuild=False):
         if not self._merge_biomasses:
@@ -268,6 +303,7 @@ class CommunityModel:
         self.metabolite_map = {}
         self.gene_map = {}
         self._reverse_map = None
+        self._exchange_table = None
 
         if self._merge_biomasses:
             self.organisms_biomass_metabolite = {}
@@ -22,12 +22,22 @@ Authors: Vitor Pereira
 """
 from mewpy.solvers.solution import Status, print_values, print_balance
 from mewpy.solvers import solver_instance
+from mewpy.solvers.solver import Parameter
 from mewpy.util.utilities import molecular_weight
 from mewpy.util.constants import ModelConstants
 from warnings import warn
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from math import inf, isinf
 
 
+@lru_cache(maxsize=None)
+def _molecular_mass(formula, element=None):
+    """Molecular mass (kg/mol) of a chemical formula, or of one of its elements"""
+    return 0.001 * molecular_weight(formula, element=element)
+
+
 def SteadyCom(community, constraints=None, solver=None):
     """ Implementation of SteadyCom (Chan et al 2017). Adapted from REFRAMED
     Args:
@@ -53,13 +63,15 @@ def SteadyCom(community, constraints=None, solver=None):
     return solution
 
 
-def SteadyComVA(community, obj_frac=1.0, constraints=None, solver=None):
+def SteadyComVA(community, obj_frac=1.0, constraints=None, solver=None, n_jobs=1):
     """ Abundance Variability Analysis using SteadyCom (Chan et al 2017). Adapated from REFRAMED
     Args:
         community (CommunityModel): community model
         obj_frac (float): minimum fraction of the maximum growth rate (default 1.0)
         constraints (dict): environmental or additional constraints (optional)
         solver (Solver): solver instance instantiated with the model, for speed (optional)
+        n_jobs (int): number of threads sharing the organism sweeps, each with its own
+            problem instance (default 1)
     Returns:
         dict: species abundance variability
     """
@@ -75,15 +87,39 @@ def SteadyComVA(community, obj_frac=1.0, constraints=None, solver=None):
     growth = obj_frac * sol.values[community.biomass]
     solver.update_growth(growth)
 
-    variability = {org_id: [None, None] for org_id in community.organisms}
+    org_ids = list(community.organisms)
+    n_jobs = max(1, min(n_jobs, len(org_ids)))
+
+    # problem instances are not thread-safe, each worker gets its own,
+    # and they are built here as building changes the community model
+    solvers = [solver]
+    for _ in range(n_jobs - 1):
+        worker_solver = build_problem(community)
+        worker_solver.update_growth(growth)
+        solvers.append(worker_solver)
+
+    def sweep(worker_solver, organisms):
+        result = {org_id: [None, None] for org_id in organisms}
+
+        for org_id in organisms:
+            sol2 = worker_solver.solve({f"x_{org_id}": 1}, minimize=True, get_values=False, constraints=constraints)
+            result[org_id][0] = sol2.fobj
+
+        for org_id in organisms:
+            sol2 = worker_solver.solve({f"x_{org_id}": 1}, minimize=False, get_values=False, constraints=constraints)
+            result[org_id][1] = sol2.fobj
+
+        return result
 
-    for org_id in community.organisms:
-        sol2 = solver.solve({f"x_{org_id}": 1}, minimize=True, get_values=False, constraints=constraints)
-        variability[org_id][0] = sol2.fobj
+    if n_jobs == 1:
+        results = [sweep(solver, org_ids)]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(sweep, solvers, [org_ids[i::n_jobs] for i in range(n_jobs)]))
 
-    for org_id in community.organisms:
-        sol2 = solver.solve({f"x_{org_id}": 1}, minimize=False, get_values=False, constraints=constraints)
-        variability[org_id][1] = sol2.fobj
+    variability = {org_id: [None, None] for org_id in org_ids}
+    for result in results:
+        variability.update(result)
 
     return variability
 
@@ -103,105 +139,140 @@ def build_problem(community, growth=1, bigM=1000):
     # What's the proper value?
     
     solver = solver_instance()
+    # binary_search only changes the growth coefficients between solves,
+    # so keep the previous basis as an advanced start, also through presolve
+    solver.set_parameter(Parameter.WARM_START, 2)
     community.add_compartments=False
     sim = community.get_community_model()
 
+    var_ids, lbs, ubs = [], [], []
+
     # create biomass variables
     for org_id in community.organisms.keys():
-        solver.add_variable(f"x_{org_id}", 0, 1, update=False)
+        var_ids.append(f"x_{org_id}")
+        lbs.append(0)
+        ubs.append(1)
 
     # create all community reactions
-    for r_id in sim.reactions:
+    exchange_set = frozenset(sim.get_exchange_reactions())
+    reactions = list(sim.reactions)
+    for r_id in reactions:
         reaction = sim.get_reaction(r_id)
-        if r_id in sim.get_exchange_reactions():
-            solver.add_variable(r_id, reaction.lb, reaction.ub, update=False)
+        var_ids.append(r_id)
+        if r_id in exchange_set:
+            lbs.append(reaction.lb)
+            ubs.append(reaction.ub)
         else:
-            lb = -inf if reaction.lb < 0 else 0
-            ub = inf if reaction.ub > 0 else 0
-            solver.add_variable(r_id, lb, ub, update=False)
+            lbs.append(-inf if reaction.lb < 0 else 0)
+            ubs.append(inf if reaction.ub > 0 else 0)
+
+    solver.add_variables(var_ids, lbs, ubs)
+
+    constr_ids, lhs, senses, rhs = [], [], [], []
 
-    solver.update()
+    def add_constraint(constr_id, expr, sense='=', value=0):
+        constr_ids.append(constr_id)
+        lhs.append(expr)
+        senses.append(sense)
+        rhs.append(value)
 
     # sum biomass = 1
-    solver.add_constraint("abundance", {f"x_{org_id}": 1 for org_id in community.organisms.keys()},
-                          rhs=1, update=False)
+    add_constraint("abundance", {f"x_{org_id}": 1 for org_id in community.organisms.keys()}, value=1)
 
     # S.v = 0
     table = sim.metabolite_reaction_lookup()
     for m_id in sim.metabolites:
-        solver.add_constraint(m_id, table[m_id], update=False)
-    solver.update()
+        add_constraint(m_id, table[m_id])
+
     # organism-specific constraints
-    for org_id, organism in community.organisms.items():
+    objectives = {org_id: set(organism.objective) for org_id, organism in community.organisms.items()}
+    for (org_id, r_id), new_id in community.reaction_map.items():
 
-        for r_id in organism.reactions:
+        reaction = community.organisms[org_id].get_reaction(r_id)
 
-            if (org_id, r_id) not in community.reaction_map:
-                continue
+        # growth = mu * X
+        if r_id in objectives[org_id]:
+            add_constraint(f"g_{org_id}", {f"x_{org_id}": growth, new_id: -1})
+        # lb * X < R < ub * X
+        else:
+            lb = -bigM if isinf(reaction.lb) else reaction.lb
+            ub = bigM if isinf(reaction.ub) else reaction.ub
 
-            new_id = community.reaction_map[(org_id, r_id)]
-            reaction = organism.get_reaction(r_id)
+            # fixed fluxes need a single row R = lb * X
+            if lb == ub:
+                if lb != 0:
+                    add_constraint(f"eq_{new_id}", {f"x_{org_id}": lb, new_id: -1})
+                continue
 
-            # growth = mu * X
-            if r_id in organism.objective.keys():
-                solver.add_constraint(f"g_{org_id}", {f"x_{org_id}": growth, new_id: -1}, update=False)
-            # lb * X < R < ub * X
-            else:
-                lb = -bigM if isinf(reaction.lb) else reaction.lb
-                ub = bigM if isinf(reaction.ub) else reaction.ub
+            if lb != 0:
+                add_constraint(f"lb_{new_id}", {f"x_{org_id}": lb, new_id: -1}, '<', 0)
 
-                if lb != 0:
-                    solver.add_constraint(f"lb_{new_id}", {f"x_{org_id}": lb, new_id: -1}, '<', 0, update=False)
+            if ub != 0:
+                add_constraint(f"ub_{new_id}", {f"x_{org_id}": ub, new_id: -1}, '>', 0)
 
-                if ub != 0:
-                    solver.add_constraint(f"ub_{new_id}", {f"x_{org_id}": ub, new_id: -1}, '>', 0, update=False)
+    solver.add_constraints(constr_ids, lhs, senses, rhs)
 
-    solver.update()
+    # (constraint, variable, value) entries of the growth rate coefficients,
+    # reused by every update instead of being rebuilt on each call
+    coefficients = [[f"g_{org_id}", f"x_{org_id}", growth] for org_id in community.organisms]
 
     def update_growth(value):
-        coefficients = [(f"g_{x}", f"x_{x}", value) for x in community.organisms]
+        if coefficients and coefficients[0][2] == value:
+            return
+        for entry in coefficients:
+            entry[2] = value
         solver.change_coefficients(coefficients)
 
     solver.update_growth = update_growth
     return solver
 
 
-def binary_search(solver, objective, obj_frac=1, minimize=False, max_iters=30, abs_tol=1e-3, constraints=None):
-    previous_value = 0
-    value = 1
-    fold = 2
-    feasible = False
-    last_feasible = 0
-
-    for i in range(max_iters):
-        diff = value - previous_value
+def binary_search(solver, objective, obj_frac=1, minimize=False, max_iters=30, abs_tol=1e-3, constraints=None,
+                  rel_tol=None):
+    """ Finds the maximum feasible community growth rate.
 
-        if diff < abs_tol:
-            break
+    The growth rate is doubled until it becomes infeasible, and the bracket between the last
+    feasible and the first infeasible growth rates is then bisected. As each LP only tells if
+    a growth rate is feasible, bisection halves the bracket in the fewest solves.
 
-        if feasible:
-            last_feasible = value
-            previous_value = value
-            value = fold*diff + value
-        else:
-            if i > 0:
-                fold = 0.5
-            value = fold*diff + previous_value
+    Args:
+        solver (Solver): a solver built with build_problem
+        objective: the objective of each solve
+        obj_frac (float): fraction of the maximum growth rate used in the final solve (default 1)
+        minimize (bool): minimize the objective (default False)
+        max_iters (int): maximum number of feasibility solves (default 30)
+        abs_tol (float): stop when the bracket is narrower than this value (default 1e-3)
+        constraints (dict): environmental or additional constraints (optional)
+        rel_tol (float): also stop when the bracket is narrower than this fraction of the
+            feasible growth rate (optional)
+    Returns:
+        Solution: the solution at the (fraction of the) maximum feasible growth rate
+    """
+    lower, upper = 0, None
+    value = 1
 
+    for _ in range(max_iters):
         solver.update_growth(value)
         sol = solver.solve(objective, get_values=False, minimize=minimize, constraints=constraints)
 
-        feasible = sol.status == Status.OPTIMAL
+        if sol.status == Status.OPTIMAL:
+            lower = value
+        else:
+            upper = value
 
-    if feasible:
-        solver.update_growth(obj_frac * value)
+        if upper is None:
+            value = 2 * value
+        else:
+            width = upper - lower
+            if width < abs_tol or (rel_tol and width < rel_tol * lower):
+                break
+            value = (lower + upper) / 2
     else:
-        solver.update_growth(obj_frac * last_feasible)
-    sol = solver.solve(objective, minimize=minimize, constraints=constraints)
-
-    if i == max_iters - 1:
         warn("Max iterations exceeded.")
 
+    solver.update_growth(obj_frac * lower)
+    sol = solver.solve(objective, minimize=minimize, constraints=constraints)
+
     return sol
 
 
@@ -236,15 +307,18 @@ class CommunitySolution(object):
     def parse_values(self):
         model = self.community.merged_model
         reaction_map = self.community.reaction_map
+        # bound lookups, used once per reaction below
+        get_value = self.values.__getitem__
+        get_new_id = reaction_map.get
 
-        self.growth = self.values[self.community.biomass]
+        self.growth = get_value(self.community.biomass)
 
         self.abundance = {}
         for org_id, organism in self.community.organisms.items():
             growth_i = self.community.organisms_biomass[org_id]
-            self.abundance[org_id] = self.values[growth_i] / self.growth
+            self.abundance[org_id] = get_value(growth_i) / self.growth
 
-        self.exchange = {r_id: self.values[r_id]
+        self.exchange = {r_id: get_value(r_id)
                          for r_id in model.get_exchange_reactions()}
 
         self.internal = {}
@@ -254,12 +328,14 @@ class CommunitySolution(object):
 
             abundance = self.abundance[org_id]
 
-            fluxes = {r_id: self.values[reaction_map[(org_id, r_id)]]
-                      for r_id in organism.reactions
-                      if (org_id, r_id) in reaction_map}
+            pairs = [(r_id, get_new_id((org_id, r_id))) for r_id in organism.reactions]
+            fluxes = {r_id: get_value(new_id) for r_id, new_id in pairs if new_id is not None}
 
-            rates = {r_id: fluxes[r_id] / abundance if abundance > 0 else 0
-                     for r_id in organism.reactions if r_id in fluxes}
+            # the abundance test is done once per organism instead of once per reaction
+            if abundance > 0:
+                rates = {r_id: flux / abundance for r_id, flux in fluxes.items()}
+            else:
+                rates = dict.fromkeys(fluxes, 0)
 
             self.internal[org_id] = fluxes
             self.normalized[org_id] = rates
@@ -267,38 +343,29 @@ class CommunitySolution(object):
     # calculate overall exchanges (organism x metabolite) -> rate
 
     def compute_exchanges(self):
-        sim = self.community.merged_model
-        reaction_map = self.community.reaction_map
-        exchanges = {}
+        rows, columns, coefficients, indptr = self.community.exchange_table
+        if not rows:
+            return {}
 
-        for m_id in sim.get_external_metabolites():
+        get_value = self.values.__getitem__
+        fluxes = np.fromiter(map(get_value, columns), dtype=float, count=len(columns))
+        rates = np.add.reduceat(coefficients * fluxes, indptr[:-1])
 
-            for org_id, organism in self.community.organisms.items():
-                rate = 0
-                if m_id not in organism.metabolites:
-                    continue
-                for r_id in organism.get_metabolite_reactions(m_id):
-                    if (org_id, r_id) not in reaction_map:
-                        continue
-
-                    flux = self.values[reaction_map[(org_id, r_id)]]
-
-                    if flux != 0:
-                        coeff = organism.get_reaction(r_id).stoichiometry[m_id]
-                        rate += coeff*flux
-
-                if rate != 0:
-                    exchanges[(org_id, m_id)] = rate
-
-        return exchanges
+        return {key: rate for key, rate in zip(rows, rates.tolist()) if rate != 0}
 
     def cross_feeding(self, as_df=True, abstol=1e-6):
         exchanges = self.compute_exchanges()
-        cross_all = []
+
+        met_exchanges = {}
+        for (org_id, m_id), rate in exchanges.items():
+            met_exchanges.setdefault(m_id, []).append((org_id, rate))
+
+        donors, receivers, compounds, rates = [], [], [], []
 
         for m_id in self.community.merged_model.get_external_metabolites():
-            r_out = {x: r for (x, m), r in exchanges.items() if m == m_id and r > abstol}
-            r_in = {x: -r for (x, m), r in exchanges.items() if m == m_id and -r > abstol}
+            entries = met_exchanges.get(m_id, ())
+            r_out = {x: r for x, r in entries if r > abstol}
+            r_in = {x: -r for x, r in entries if -r > abstol}
 
             total_in = sum(r_in.values())
             total_out = sum(r_out.values())
@@ -309,28 +376,41 @@ class CommunitySolution(object):
             if total_out > total_in:
                 r_in[None] = total_out - total_in
 
-            cross = [(o1, o2, m_id, r1 * r2 / total) for o1, r1 in r_out.items() for o2, r2 in r_in.items()]
-            cross_all.extend(cross)
+            if not r_out or not r_in:
+                continue
+
+            # donor x receiver rates, in row-major (donor, receiver) order
+            cross = np.outer(list(r_out.values()), list(r_in.values())) / total
+            donors.append(np.repeat(np.array(list(r_out), dtype=object), len(r_in)))
+            receivers.append(np.tile(np.array(list(r_in), dtype=object), len(r_out)))
+            compounds.append(np.full(cross.size, m_id, dtype=object))
+            rates.append(cross.ravel())
+
+        if rates:
+            cross_all = [np.concatenate(donors), np.concatenate(receivers),
+                         np.concatenate(compounds), np.concatenate(rates)]
+        else:
+            cross_all = [np.empty(0, dtype=object)] * 3 + [np.empty(0)]
 
         if as_df:
             from pandas import DataFrame
-            cross_all = DataFrame(cross_all, columns=["donor", "receiver", "compound", "rate"])
+            columns = ["donor", "receiver", "compound", "rate"]
+            return DataFrame(dict(zip(columns, cross_all)), columns=columns)
 
-        return cross_all
+        return list(zip(*cross_all[:3], cross_all[3].tolist()))
 
     def mass_flow(self, element=None, as_df=False, abstol=1e-6):
 
-        def get_mass(x):
-            met = self.community.merged_model.get_metabolite(x)
-            formula = x.formula
-            mw = molecular_weight(formula, element=element)
-            return 0.001 * mw
+        model = self.community.merged_model
+        masses = {}
 
         entities = list(self.community.organisms) + [None]
         flow = {(o1, o2): 0 for o1 in entities for o2 in entities}
 
         for o1, o2, m_id, rate in self.cross_feeding(as_df=False):
-            flow[(o1, o2)] += get_mass(m_id) * rate
+            if m_id not in masses:
+                masses[m_id] = _molecular_mass(model.get_metabolite(m_id).formula, element)
+            flow[(o1, o2)] += masses[m_id] * rate
 
         flow = {key: val for key, val in flow.items() if val > abstol}
 
@@ -358,40 +438,41 @@ class CommunitySolution(object):
     def print_exchanges(self, m_id=None, abstol=1e-9):
 
         model = self.community.merged_model
-        exchange_rxns = set(model.get_exchange_reactions())
 
         if m_id:
             mets = [m_id]
         else:
             mets = model.get_external_metabolites()
 
-        for m_id in mets:
-
-            entries = []
+        # community exchange rates of all metabolites, in a single pass
+        get_value = self.values.__getitem__
+        get_reaction = model.get_reaction
+        ex_mets, coeffs, fluxes = [], [], []
+        for r_id in model.get_exchange_reactions():
+            flux = get_value(r_id)
+            for met, coeff in get_reaction(r_id).stoichiometry.items():
+                ex_mets.append(met)
+                coeffs.append(coeff)
+                fluxes.append(flux)
+        rates = np.array(coeffs, dtype=float) * np.array(fluxes, dtype=float)
+
+        met_entries = {}
+
+        for met, rate in zip(ex_mets, rates.tolist()):
+            if rate > abstol:
+                met_entries.setdefault(met, []).append(('=> *   ', "in", rate))
+            elif rate < -abstol:
+                met_entries.setdefault(met, []).append(('   * =>', "out", rate))
+
+        for (org_id, met), rate in self.exchange_map.items():
+            if rate > abstol:
+                met_entries.setdefault(met, []).append(('O --> *', org_id, rate))
+            elif rate < -abstol:
+                met_entries.setdefault(met, []).append(('* --> O', org_id, rate))
 
-            ext_rxns = set(model.get_metabolite_reactions(m_id)) & exchange_rxns
-
-            for r_id in ext_rxns:
-
-                flux = self.values[r_id]
-                coeff = model.reactions[r_id].stoichiometry[m_id]
-                rate = coeff*flux
-
-                if rate > abstol:
-                    entries.append(('=> *   ', "in", rate))
-                elif rate < -abstol:
-                    entries.append(('   * =>', "out", rate))
-
-            for org_id in self.community.organisms:
-
-                if (org_id, m_id) not in self.exchange_map:
-                    continue
+        for m_id in mets:
 
-                rate = self.exchange_map[(org_id, m_id)]
-                if rate > abstol:
-                    entries.append(('O --> *', org_id, rate))
-                elif rate < -abstol:
-                    entries.append(('* --> O', org_id, rate))
+            entries = met_entries.get(m_id)
 
             if entries:
                 print(m_id)
@@ -2,7 +2,9 @@ from collections import namedtuple
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Tuple, Union, Dict, Callable
 
-from math import log, exp
+from math import exp
+
+import numpy as np
 
 from mewpy.germ.algebra import And, Or
 from mewpy.solvers.solution import Status
@@ -109,11 +111,12 @@ def concentration_to_lb(concentration,
 
 
 def lb_soft_plus(soft_plus, coefficient):
-    return -1 * log(1 + exp(soft_plus + abs(coefficient)))
+    # log(1 + exp(x)) computed without overflow for large coefficients
+    return -1 * np.logaddexp(0, soft_plus + np.abs(coefficient))
 
 
 def ub_soft_plus(soft_plus, coefficient):
-    return log(1 + exp(soft_plus + coefficient))
+    return np.logaddexp(0, soft_plus + coefficient)
 
 
 def euler_step_biomass(old_biomass_yield, growth_rate, time_step):
@@ -138,32 +141,27 @@ def metabolites_constraints(constraints: Dict[str, Tuple[float, float]],
                             biomass: CoRegBiomass,
                             time_step: float):
     constraints = constraints.copy()
-    for metabolite in metabolites.values():
+    if not metabolites:
+        return constraints
+
+    exchanges = [metabolite.exchange for metabolite in metabolites.values()]
+    concentrations = np.fromiter((metabolite.concentration for metabolite in metabolites.values()),
+                                 dtype=float, count=len(exchanges))
+    prev_bounds = np.array([constraints[rxn] for rxn in exchanges], dtype=float).reshape(-1, 2)
+    prev_lb = prev_bounds[:, 0]
 
-        next_lb = concentration_to_lb(concentration=metabolite.concentration,
+    with np.errstate(divide='raise', invalid='raise'):
+        next_lb = concentration_to_lb(concentration=concentrations,
                                       biomass=biomass.biomass_yield,
                                       time_step=time_step)
 
-        rxn = metabolite.exchange
-
-        if next_lb < ModelConstants.TOLERANCE:
-            next_lb = 0
-
-        prev_lb, prev_ub = constraints[rxn]
-
-        if prev_lb == 0:
-            next_lb = -next_lb
+    next_lb[next_lb < ModelConstants.TOLERANCE] = 0
 
-        else:
-
-            if abs(prev_lb) < abs(next_lb):
-                next_lb = prev_lb
-
-            else:
-                next_lb = -abs(next_lb)
-
-        constraints[rxn] = (next_lb, prev_ub)
+    next_lb = np.where(prev_lb == 0,
+                       -next_lb,
+                       np.where(np.abs(prev_lb) < np.abs(next_lb), prev_lb, -np.abs(next_lb)))
 
+    constraints.update(zip(exchanges, zip(next_lb.tolist(), prev_bounds[:, 1].tolist())))
     return constraints
 
 
@@ -200,32 +198,28 @@ def gene_state_constraints(model: Union['Model', 'MetabolicModel', 'RegulatoryMo
     constraints = constraints.copy()
 
     reactions_state = continuous_gpr(model=model, state=state, scale=scale)
+    if not reactions_state:
+        return constraints
+
+    reactions = list(reactions_state)
+    coefficients = np.fromiter(reactions_state.values(), dtype=float, count=len(reactions))
+    old_bounds = np.array([constraints[reaction] for reaction in reactions], dtype=float).reshape(-1, 2)
+    old_lb = old_bounds[:, 0]
+    old_ub = old_bounds[:, 1]
+
     # find the reactions which lower bound was changed by the rules
     # find the reactions which upper bound was changed by the rules
     # evaluate the soft plus over the bounds computed using the continuous version of the gpr rules
     # gene_state_bounds does not contain reactions without gpr rules
-    for reaction, coefficient in reactions_state.items():
-
-        old_lb, old_ub = constraints[reaction]
-
-        if coefficient > tolerance:
-
-            if abs(old_lb) > tolerance:
-                new_lb = lb_soft_plus(soft_plus=soft_plus, coefficient=coefficient)
-            else:
-                new_lb = old_lb
-
-            if old_ub > tolerance:
-                new_ub = ub_soft_plus(soft_plus=soft_plus, coefficient=coefficient)
-            else:
-                new_ub = old_ub
-
-        else:
-            new_lb = old_lb
-            new_ub = old_ub
-
-        constraints[reaction] = (new_lb, new_ub)
-
+    active = coefficients > tolerance
+    new_lb = np.where(active & (np.abs(old_lb) > tolerance),
+                      lb_soft_plus(soft_plus=soft_plus, coefficient=coefficients),
+                      old_lb)
+    new_ub = np.where(active & (old_ub > tolerance),
+                      ub_soft_plus(soft_plus=soft_plus, coefficient=coefficients),
+                      old_ub)
+
+    constraints.update(zip(reactions, zip(new_lb.tolist(), new_ub.tolist())))
     return constraints
 
 
@@ -251,21 +245,23 @@ def system_state_update(model: Union['Model', 'MetabolicModel', 'RegulatoryModel
 
     next_biomass = build_biomass(model, biomass_yield)
 
-    next_metabolites = {}
-
-    for met_id, met in metabolites.items():
+    if not metabolites:
+        return next_biomass, {}
 
-        concentration = euler_step_metabolites(metabolite_concentration=met.concentration,
-                                               metabolite_rate=flux_state[met.exchange],
-                                               old_biomass_yield=old_biomass_yield,
-                                               growth_rate=growth_rate,
-                                               time_step=time_step)
+    # euler step for all metabolites at once
+    concentrations = np.fromiter((met.concentration for met in metabolites.values()),
+                                 dtype=float, count=len(metabolites))
+    rates = np.fromiter((flux_state[met.exchange] for met in metabolites.values()),
+                        dtype=float, count=len(metabolites))
 
-        if concentration < 0:
-            concentration = 0
+    concentrations = euler_step_metabolites(metabolite_concentration=concentrations,
+                                            metabolite_rate=rates,
+                                            old_biomass_yield=old_biomass_yield,
+                                            growth_rate=growth_rate,
+                                            time_step=time_step)
+    concentrations[concentrations < 0] = 0
 
-        next_metabolites[met_id] = CoRegMetabolite(id=met_id,
-                                                   concentration=concentration,
-                                                   exchange=met.exchange)
+    next_metabolites = {met_id: CoRegMetabolite(id=met_id, concentration=concentration, exchange=met.exchange)
+                        for (met_id, met), concentration in zip(metabolites.items(), concentrations.tolist())}
 
     return next_biomass, next_metabolites
@@ -1,3 +1,7 @@
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from typing import TYPE_CHECKING, Union, Dict, Sequence, List, Tuple
 
 import numpy as np
@@ -8,9 +12,8 @@ from mewpy.germ.analysis.analysis_utils import biomass_yield_to_rate, \
     CoRegMetabolite, CoRegBiomass, metabolites_constraints, gene_state_constraints, system_state_update, \
     build_metabolites, build_biomass, CoRegResult
 from mewpy.germ.solution import ModelSolution, DynamicSolution
-from mewpy.germ.variables import Gene, Target
 from mewpy.solvers.solution import Solution, Status
-from mewpy.solvers.solver import Solver
+from mewpy.solvers.solver import Solver, Parameter
 from mewpy.util.constants import ModelConstants
 
 if TYPE_CHECKING:
@@ -24,10 +27,10 @@ def _run_and_decode(lp, additional_constraints=None, solver_kwargs=None):
     if additional_constraints:
         solver_kwargs['constraints'] = {**solver_kwargs.get('constraints', {}), **additional_constraints}
 
-    solution = lp.solver.solve(**solver_kwargs)
+    solution = lp.solver.solve(**lp._solver_kwargs(solver_kwargs))
 
     if not solution.values:
-        return {rxn: 0 for rxn in lp.model.reactions}, 0
+        return lp._get_zero_values(), 0
 
     return solution.values, solution.fobj
 
@@ -35,6 +38,7 @@ def _run_and_decode(lp, additional_constraints=None, solver_kwargs=None):
 def result_to_solution(result: CoRegResult, model: 'Model', to_solver: bool = False) -> Union[ModelSolution, Solution]:
     """
     It converts a CoRegResult object to a ModelSolution object.
+    A new object is always returned, as dynamic solutions keep the solution of every time step.
 
     :param result: the CoRegResult object
     :param model: the model
@@ -57,6 +61,8 @@ def result_to_solution(result: CoRegResult, model: 'Model', to_solver: bool = Fa
 
 
 class CoRegFlux(FBA):
+    __slots__ = ('_default_constraints', '_solver_bounds', '_zero_values', '_metabolites_cache', '_biomass_cache',
+                 '_default_growth_rate')
 
     def __init__(self,
                  model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
@@ -83,8 +89,104 @@ class CoRegFlux(FBA):
         :param build: Whether to build the linear problem upon instantiation. Default: False
         :param attach: Whether to attach the linear problem to the model upon instantiation. Default: False
         """
+        # reactions' bounds of the model at build time. They are the starting constraints of every time step
+        self._default_constraints = None
+        # variables' bounds as loaded into the solver at build time
+        self._solver_bounds = None
+        # null flux state returned for infeasible time steps
+        self._zero_values = None
+        # last metabolites and biomass built from the optimize inputs
+        self._metabolites_cache = None
+        self._biomass_cache = None
+        # growth rate of the model without temporary solver arguments
+        self._default_growth_rate = None
         super().__init__(model=model, solver=solver, build=build, attach=attach)
 
+    def _build(self):
+        """
+        It builds the linear problem from the model and caches the reactions' bounds used as default constraints
+        in each time step.
+        :return:
+        """
+        super()._build()
+        self._default_constraints = {reaction.id: reaction.bounds for reaction in self.model.yield_reactions()}
+        self._solver_bounds = {name: (lb, ub)
+                               for variable in self._variables.values()
+                               for name, (lb, ub, _) in variable.items()}
+        self._zero_values = dict.fromkeys(self._default_constraints, 0)
+        self._metabolites_cache = None
+        self._biomass_cache = None
+        self._default_growth_rate = None
+
+    def _get_default_constraints(self) -> Dict[str, Tuple[float, float]]:
+        """
+        It returns a copy of the reactions' bounds of the model.
+        The cached bounds are only used while the linear problem is synchronized with the model.
+        :return: a dictionary of reaction ids and bounds
+        """
+        if not self.synchronized or self._default_constraints is None:
+            return {reaction.id: reaction.bounds for reaction in self.model.yield_reactions()}
+
+        return dict(self._default_constraints)
+
+    def _get_zero_values(self) -> Dict[str, float]:
+        """
+        It returns a null flux state for all reactions of the model. It is used when a time step is infeasible.
+        :return: a dictionary of reaction ids and null fluxes
+        """
+        if not self.synchronized or self._zero_values is None:
+            return dict.fromkeys(self.model.reactions, 0)
+
+        return dict(self._zero_values)
+
+    def _get_growth_rate(self, solver_kwargs: Dict = None) -> float:
+        """
+        It computes the initial growth rate of the model. Only the objective value is retrieved from the solver.
+        The growth rate is cached if no temporary solver arguments (e.g. objective or constraints) are provided.
+        :param solver_kwargs: solver arguments
+        :return: the growth rate
+        """
+        solver_kwargs = {key: value for key, value in (solver_kwargs or {}).items() if key != 'get_values'}
+        cache = self.synchronized and not solver_kwargs
+
+        if cache and self._default_growth_rate is not None:
+            return self._default_growth_rate
+
+        solution = self.solver.solve(get_values=False, **self._solver_kwargs(solver_kwargs))
+        growth_rate = solution.fobj if solution.status == Status.OPTIMAL else 0
+
+        if cache:
+            self._default_growth_rate = growth_rate
+        return growth_rate
+
+    def _build_metabolites(self, metabolites: Dict[str, float]) -> Dict[str, CoRegMetabolite]:
+        """
+        It builds the metabolites constraints, reusing the last ones if the concentrations did not change.
+        CoRegMetabolite objects are immutable, so they can be shared between simulations.
+        :param metabolites: a dictionary of metabolites ids and concentrations
+        :return: a dictionary of metabolites ids and CoRegMetabolite objects
+        """
+        key = tuple(metabolites.items())
+
+        if self.synchronized and self._metabolites_cache is not None and self._metabolites_cache[0] == key:
+            return dict(self._metabolites_cache[1])
+
+        coreg_metabolites = build_metabolites(self.model, metabolites)
+        self._metabolites_cache = (key, coreg_metabolites)
+        return dict(coreg_metabolites)
+
+    def _build_biomass(self, growth_rate: float) -> CoRegBiomass:
+        """
+        It builds the biomass constraint, reusing the last one if the growth rate did not change.
+        :param growth_rate: the initial growth rate
+        :return: a CoRegBiomass object
+        """
+        if self.synchronized and self._biomass_cache is not None and self._biomass_cache.biomass_yield == growth_rate:
+            return self._biomass_cache
+
+        self._biomass_cache = build_biomass(self.model, growth_rate)
+        return self._biomass_cache
+
     # ---------------------------------
     # Dynamic simulation
     # ---------------------------------
@@ -112,7 +214,7 @@ class CoRegFlux(FBA):
         # Similar to the Simulation_step in the R implementation
         result = CoRegResult()
 
-        constraints = {reaction.id: reaction.bounds for reaction in self.model.yield_reactions()}
+        constraints = self._get_default_constraints()
 
         if metabolites:
             # updating coregflux constraints using metabolites concentrations
@@ -131,8 +233,19 @@ class CoRegFlux(FBA):
                                                  tolerance=tolerance,
                                                  scale=scale)
 
+        # only the bounds that differ from the ones loaded in the solver are temporarily changed,
+        # so that consecutive time steps disturb the previous basis as little as possible.
+        # User constraints are always overridden, as before
+        additional_constraints = constraints
+        if self.synchronized and self._solver_bounds is not None:
+            user_constraints = solver_kwargs.get('constraints', {}) if solver_kwargs else {}
+            additional_constraints = {rxn: bounds for rxn, bounds in constraints.items()
+                                      if rxn in user_constraints or self._solver_bounds.get(rxn) != bounds}
+
         # retrieve the fba simulation from the inferred constraints
-        values, objective_value = _run_and_decode(self, additional_constraints=constraints, solver_kwargs=solver_kwargs)
+        values, objective_value = _run_and_decode(self,
+                                                  additional_constraints=additional_constraints,
+                                                  solver_kwargs=solver_kwargs)
         result.values = values
         result.objective_value = objective_value
 
@@ -160,12 +273,15 @@ class CoRegFlux(FBA):
                           soft_plus: float = 0,
                           tolerance: float = ModelConstants.TOLERANCE,
                           scale: bool = False) -> Union[DynamicSolution, Dict[float, Solution]]:
+        # consecutive time steps only change a few bounds, so the previous basis is kept as an advanced start
+        self.solver.set_parameter(Parameter.WARM_START, 2)
+
         solutions = []
 
-        previous_time_step = 0
-        for i_initial_state, time_step in zip(initial_state, time_steps):
-            time_step_diff = time_step - previous_time_step
+        # length of each time step, the first one starting at time 0
+        time_steps_diff = np.diff(time_steps, prepend=0).tolist()
 
+        for i_initial_state, time_step_diff in zip(initial_state, time_steps_diff):
             next_state = self.next_state(solver_kwargs=solver_kwargs,
                                          state=i_initial_state,
                                          metabolites=metabolites,
@@ -175,8 +291,6 @@ class CoRegFlux(FBA):
                                          tolerance=tolerance,
                                          scale=scale)
 
-            previous_time_step = time_step
-
             metabolites = next_state.metabolites
             biomass = next_state.biomass
 
@@ -302,10 +416,10 @@ class CoRegFlux(FBA):
             metabolites = {}
 
         if growth_rate is None:
-            _, growth_rate = _run_and_decode(self, solver_kwargs=solver_kwargs)
+            growth_rate = self._get_growth_rate(solver_kwargs)
 
-        metabolites = build_metabolites(self.model, metabolites)
-        biomass = build_biomass(self.model, growth_rate)
+        metabolites = self._build_metabolites(metabolites)
+        biomass = self._build_biomass(growth_rate)
         return self._optimize(to_solver=to_solver,
                               solver_kwargs=solver_kwargs,
                               initial_state=initial_state,
@@ -316,26 +430,67 @@ class CoRegFlux(FBA):
                               tolerance=tolerance,
                               scale=scale)
 
+    def optimize_trajectories(self,
+                              initial_states: Sequence[Union[Dict[str, float], Sequence[Dict[str, float]]]],
+                              to_solver: bool = False,
+                              solver_kwargs: Dict = None,
+                              metabolites: Dict[str, float] = None,
+                              growth_rate: float = None,
+                              time_steps: Sequence[float] = None,
+                              soft_plus: float = 0,
+                              tolerance: float = ModelConstants.TOLERANCE,
+                              scale: bool = False,
+                              n_jobs: int = 1) -> List[Union[DynamicSolution, ModelSolution, Solution,
+                                                             Dict[float, Solution]]]:
+        """
+        CoRegFlux optimization of several independent conditions (e.g. a parameter sweep).
+        Each initial state (or sequence of initial states for dynamic optimization) is simulated independently
+        with the same metabolites, growth rate and time steps. See optimize for details.
+        :param initial_states: a list of initial states, one for each condition
+        :param n_jobs: the number of threads sharing the conditions, each with its own linear problem. Default: 1
+        :return: a list with the result of optimize for each condition
+        """
+        n_jobs = max(1, min(n_jobs, len(initial_states)))
+
+        # linear problems are not thread-safe, so each worker gets its own.
+        # They are built here, as building reads the model
+        problems = [self]
+        for _ in range(n_jobs - 1):
+            solver = self._initial_solver
+            if isinstance(solver, Solver):
+                solver = type(solver)()
+
+            problems.append(CoRegFlux(model=self.model, solver=solver, build=True))
+
+        def simulate(problem, states):
+            return [problem.optimize(to_solver=to_solver,
+                                     solver_kwargs=dict(solver_kwargs) if solver_kwargs else None,
+                                     initial_state=state,
+                                     metabolites=metabolites,
+                                     growth_rate=growth_rate,
+                                     time_steps=time_steps,
+                                     soft_plus=soft_plus,
+                                     tolerance=tolerance,
+                                     scale=scale)
+                    for state in states]
+
+        if n_jobs == 1:
+            return simulate(self, initial_states)
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(simulate, problems, [initial_states[i::n_jobs] for i in range(n_jobs)]))
+
+        # restoring the order of the conditions
+        solutions = [None] * len(initial_states)
+        for i, result in enumerate(results):
+            solutions[i::n_jobs] = result
+        return solutions
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Preprocessing using LinearRegression to predict genes expression from regulators co-expression
 # Useful for CoRegFlux method
 # ----------------------------------------------------------------------------------------------------------------------
-def _get_target_regulators(gene: Union['Gene', 'Target'] = None) -> List[str]:
-    """
-    It returns the list of regulators of a target gene
-    :param gene: Target gene
-    :return: List of regulators of the target gene
-    """
-    if gene is None:
-        return []
-
-    if gene.is_target():
-        return [regulator.id for regulator in gene.yield_regulators()]
-
-    return []
-
-
 def _filter_influence_and_expression(interactions: Dict[str, List[str]],
                                      influence: pd.DataFrame,
                                      expression: pd.DataFrame,
@@ -351,68 +506,150 @@ def _filter_influence_and_expression(interactions: Dict[str, List[str]],
     targets = pd.Index(set(interactions.keys()))
     regulators = pd.Index(set([regulator for regulators in interactions.values() for regulator in regulators]))
 
-    # filter the expression matrix for the target genes only
-    expression = expression.loc[expression.index.intersection(targets)].copy()
-    influence = influence.loc[influence.index.intersection(regulators)].copy()
-    experiments = experiments.loc[experiments.index.intersection(regulators)].copy()
+    # filter the expression matrix for the target genes only.
+    # The filtered matrices are only read downstream, so they are not copied
+    expression = expression.loc[expression.index.intersection(targets)]
+    influence = influence.loc[influence.index.intersection(regulators)]
+    experiments = experiments.loc[experiments.index.intersection(regulators)]
     return influence, expression, experiments
 
 
-def _predict_experiment(interactions: Dict[str, List[str]],
-                        influence: pd.DataFrame,
-                        expression: pd.DataFrame,
-                        experiment: pd.Series) -> pd.Series:
-    try:
-        # noinspection PyPackageRequirements
-        from sklearn.linear_model import LinearRegression
-    except ImportError:
-        raise ImportError('The package sklearn is not installed. '
-                          'To compute the probability of target-regulator interactions, please install sklearn '
-                          '(pip install sklearn).')
-
-    predictions = {}
-
-    for target, regulators in interactions.items():
-
-        if not regulators:
-            predictions[target] = np.nan
+def _fit_gene_expression(interactions: Dict[str, List[str]],
+                         influence_genes: Sequence[str],
+                         influence: np.ndarray,
+                         expression_genes: Sequence[str],
+                         expression: np.ndarray,
+                         regulators: Sequence[str]) -> Tuple[List[str], List[Tuple[np.ndarray, ...]]]:
+    """
+    It fits a linear regression model of the expression of each target gene as function of the influence scores
+    of its regulators. Targets sharing the same set of regulators are fitted together.
+    :param interactions: Dictionary with the interactions between targets and regulators
+    :param influence_genes: Regulators of the influence matrix rows
+    :param influence: Influence matrix values
+    :param expression_genes: Genes of the expression matrix rows
+    :param expression: Expression matrix values
+    :param regulators: Regulators available for prediction
+    :return: Targets that could be fitted and, for each group of targets, the targets positions,
+    the positions of their regulators in the regulators available for prediction,
+    the coefficients matrix (rows: targets, columns: regulators) and the intercepts
+    """
+    # positions of the genes in the data sets are resolved once for all targets
+    expression_rows = {gene: i for i, gene in enumerate(expression_genes)}
+    influence_rows = {regulator: i for i, regulator in enumerate(influence_genes)}
+    regulators_cols = {regulator: i for i, regulator in enumerate(regulators)}
+
+    # targets sharing the same set of regulators share the same training matrix, so they are fitted together
+    groups = {}
+    targets = []
+    targets_rows = []
+    for target, target_regulators in interactions.items():
+
+        if not target_regulators:
             continue
 
-        if target not in expression.index:
-            predictions[target] = np.nan
+        target_row = expression_rows.get(target)
+        if target_row is None:
             continue
 
-        if not set(regulators).issubset(influence.index):
-            predictions[target] = np.nan
-            continue
+        group_regulators = tuple(sorted(set(target_regulators)))
 
-        if not set(regulators).issubset(experiment.index):
-            predictions[target] = np.nan
+        if not all(regulator in influence_rows and regulator in regulators_cols for regulator in group_regulators):
             continue
 
+        groups.setdefault(group_regulators, []).append(len(targets))
+        targets.append(target)
+        targets_rows.append(target_row)
+
+    fits = []
+    for group_regulators, rows in groups.items():
         # a linear regression model is trained for
         # y = expression of the target gene for all samples
         # x1 = influence score of the regulator 1 in the train data set
         # x2 = influence score of the regulator 2 in the train data set
         # x3 ...
+        # the least squares problem is solved on centered data, as done by sklearn's LinearRegression,
+        # such that the intercept is not penalized in the minimum-norm solution.
+        # All targets of the group are solved at once as multiple right-hand sides
+        x = influence[[influence_rows[regulator] for regulator in group_regulators]].T
+        y = expression[[targets_rows[row] for row in rows]].T
+
+        x_mean = x.mean(axis=0)
+        y_mean = y.mean(axis=0)
+        coefs = np.linalg.lstsq(x - x_mean, y - y_mean, rcond=None)[0]
+
+        fits.append((np.array(rows, dtype=np.intp),
+                     np.array([regulators_cols[regulator] for regulator in group_regulators], dtype=np.intp),
+                     coefs.T,
+                     y_mean - x_mean @ coefs))
+
+    return targets, fits
+
+
+# fitted regression models of the most recent training data sets, keyed by a hash of their contents.
+# Only the hashes and the fitted models are kept, not the training data
+_FITS_CACHE = OrderedDict()
+_FITS_CACHE_SIZE = 8
+_FITS_CACHE_LOCK = Lock()
+
+
+def _frame_digest(frame: pd.DataFrame) -> str:
+    """
+    It returns a hash of the labels and values of a data frame
+    :param frame: Data frame
+    :return: hexadecimal digest of the data frame
+    """
+    digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(frame.columns, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _cached_fit_gene_expression(interactions: Dict[str, List[str]],
+                                influence: pd.DataFrame,
+                                expression: pd.DataFrame,
+                                regulators: Sequence[str]) -> Tuple[List[str], List[Tuple[np.ndarray, ...]]]:
+    """
+    Memoized version of _fit_gene_expression. The fitted models are deterministic functions of the
+    interactions and training data, so repeated predictions with the same training data reuse them.
+    The fits are cached by the interactions, the regulators and a hash of the contents of the influence and
+    expression data frames. Only the most recent fits are kept (least recently used).
+    :param interactions: Dictionary with the interactions between targets and regulators
+    :param influence: Influence matrix
+    :param expression: Expression matrix
+    :param regulators: Regulators available for prediction
+    :return: targets and fitted models
+    """
+    key = (tuple((target, tuple(target_regulators)) for target, target_regulators in interactions.items()),
+           _frame_digest(influence),
+           _frame_digest(expression),
+           tuple(regulators))
 
-        x = influence.loc[regulators].transpose().to_numpy()
-        y = expression.loc[target].to_numpy()
+    with _FITS_CACHE_LOCK:
+        fits = _FITS_CACHE.get(key)
+        if fits is not None:
+            _FITS_CACHE.move_to_end(key)
+            return fits
 
-        regressor = LinearRegression()
-        regressor.fit(x, y)
+    fits = _fit_gene_expression(interactions=interactions,
+                                influence_genes=influence.index,
+                                influence=influence.to_numpy(dtype=float),
+                                expression_genes=expression.index,
+                                expression=expression.to_numpy(dtype=float),
+                                regulators=regulators)
 
-        # the expression of the target gene is predicted for the experiment
-        x_pred = experiment.loc[regulators].to_frame().transpose().to_numpy()
-        predictions[target] = regressor.predict(x_pred)[0]
+    with _FITS_CACHE_LOCK:
+        _FITS_CACHE[key] = fits
+        while len(_FITS_CACHE) > _FITS_CACHE_SIZE:
+            _FITS_CACHE.popitem(last=False)
 
-    return pd.Series(predictions)
+    return fits
 
 
 def predict_gene_expression(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
                             influence: pd.DataFrame,
                             expression: pd.DataFrame,
-                            experiments: pd.DataFrame) -> pd.DataFrame:
+                            experiments: pd.DataFrame,
+                            n_jobs: int = 1,
+                            dtype: Union[str, np.dtype] = np.float64) -> pd.DataFrame:
     """
     It predicts the expression of genes in the experiments set using the co-expression of regulators
     in the expression and influence datasets.
@@ -437,23 +674,53 @@ def predict_gene_expression(model: Union['Model', 'MetabolicModel', 'RegulatoryM
     :param influence: Influence scores of the regulators in the train data set
     :param expression: Expression of the genes in the train data set
     :param experiments: Influence scores of the regulators in the test data set
+    :param n_jobs: the number of threads sharing the experiments. Default: 1
+    :param dtype: the floating point precision of the predictions step. Single precision (np.float32) halves
+    the memory traffic for large experiments sets. The regression models are always fitted in double precision
+    and the result is returned in double precision. Default: np.float64
     :return: Predicted expression of the genes in the test data set
     """
     # Filtering only the gene expression and influences data of metabolic genes available in the model
-    interactions = {target.id: _get_target_regulators(target) for target in model.yield_targets()}
+    # the model only yields Target objects, so their regulators are read directly.
+    # The interaction's regulators are keyed by id, which avoids copying and walking the regulator objects
+    interactions = {target.id: list(target.interaction.regulators) if target.interaction else []
+                    for target in model.yield_targets()}
     influence, expression, experiments = _filter_influence_and_expression(interactions=interactions,
                                                                           influence=influence,
                                                                           expression=expression,
                                                                           experiments=experiments)
 
-    predictions = []
-    for column in experiments.columns:
-        experiment_prediction = _predict_experiment(interactions=interactions,
-                                                    influence=influence,
-                                                    expression=expression,
-                                                    experiment=experiments[column])
-        predictions.append(experiment_prediction)
-
-    predictions = pd.concat(predictions, axis=1)
-    predictions.columns = experiments.columns
-    return predictions.dropna()
+    # the regression models do not depend on the experiments, so they are fitted once
+    targets, fits = _cached_fit_gene_expression(interactions=interactions,
+                                                influence=influence,
+                                                expression=expression,
+                                                regulators=experiments.index)
+
+    # the expression of the target genes is predicted for all experiments at once, one matmul per group of targets.
+    # Only the regulators of each group are used, so a missing influence score only invalidates
+    # the predictions of the targets it regulates
+    experiments_arr = experiments.to_numpy(dtype=dtype)
+    predictions = np.empty((len(targets), experiments_arr.shape[1]), dtype=dtype)
+    if predictions.dtype != np.float64:
+        fits = [(rows, cols, coefs.astype(dtype), intercepts.astype(dtype)) for rows, cols, coefs, intercepts in fits]
+
+    def predict(columns):
+        for rows, cols, coefs, intercepts in fits:
+            predictions[rows, columns] = coefs @ experiments_arr[cols, columns] + intercepts[:, None]
+
+    # experiments are independent, so large sets can be split over threads (BLAS releases the GIL).
+    # Few experiments are not worth the threads overhead
+    n_jobs = max(1, min(n_jobs, experiments_arr.shape[1] // 4))
+    if n_jobs == 1:
+        predict(slice(None))
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(predict, [slice(i, None, n_jobs) for i in range(n_jobs)]))
+
+    # targets with missing predictions are dropped before wrapping the array, rather than with dropna
+    complete = ~np.isnan(predictions).any(axis=1)
+    if not complete.all():
+        predictions = predictions[complete]
+        targets = [target for target, is_complete in zip(targets, complete) if is_complete]
+
+    return pd.DataFrame(predictions.astype(np.float64, copy=False), index=targets, columns=experiments.columns)
@@ -7,6 +7,7 @@ from mewpy.solvers.solver import VarType, Solver
 
 
 class FBA(LinearProblem):
+    __slots__ = ()
 
     def __init__(self,
                  model: Union[Model, MetabolicModel, RegulatoryModel],
@@ -35,25 +36,27 @@ class FBA(LinearProblem):
 
         constraints = {metabolite.id: ConstraintContainer(name=metabolite.id, lbs=[0.0], ubs=[0.0], coefs=[{}])
                        for metabolite in self.model.yield_metabolites()}
+        # the coefficients dictionary of each mass balance row is resolved once, so that the reactions loop
+        # below only performs dictionary lookups instead of container attribute lookups
+        rows = {met_id: constraint.coefs[0] for met_id, constraint in constraints.items()}
         variables = {}
 
         for reaction in self.model.yield_reactions():
-            if reaction.gpr.is_none:
+            rxn_id = reaction.id
+            gpr = reaction.gpr
+
+            if gpr.is_none or gpr.evaluate(values=gene_state):
                 lb, ub = reaction.bounds
 
             else:
-                res = reaction.gpr.evaluate(values=gene_state)
-                if not res:
-                    lb, ub = 0.0, 0.0
-                else:
-                    lb, ub = reaction.bounds
+                lb, ub = 0.0, 0.0
 
-            variable = VariableContainer(name=reaction.id, sub_variables=[reaction.id],
+            variable = VariableContainer(name=rxn_id, sub_variables=[rxn_id],
                                          lbs=[float(lb)], ubs=[float(ub)], variables_type=[VarType.CONTINUOUS])
-            variables[reaction.id] = variable
+            variables[rxn_id] = variable
 
             for metabolite, stoichiometry in reaction.stoichiometry.items():
-                constraints[metabolite.id].coefs[0][reaction.id] = stoichiometry
+                rows[metabolite.id][rxn_id] = stoichiometry
 
         self.add_variables(*variables.values())
         self.add_constraints(*constraints.values())
@@ -65,11 +68,11 @@ class FBA(LinearProblem):
         variables and constraints. The linear problem is then loaded into the solver.
         :return:
         """
-        if self.model.is_metabolic():
+        if self._is_model_type('metabolic'):
             # mass balance constraints and reactions' variables
             self._build_mass_constraints()
 
-            self._linear_objective = {var.id: value for var, value in self.model.objective.items()}
+            self._linear_objective = self._get_model_objective()
             self._minimize = False
 
         return
@@ -80,4 +83,4 @@ class FBA(LinearProblem):
         :param solver_kwargs: A dictionary of keyword arguments to be passed to the solver.
         :return: A Solution instance.
         """
-        return self.solver.solve(**solver_kwargs)
+        return self.solver.solve(**self._solver_kwargs(solver_kwargs))
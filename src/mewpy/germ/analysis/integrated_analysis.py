@@ -1,11 +1,13 @@
-from collections import defaultdict
 from typing import Union, TYPE_CHECKING, Dict, Tuple, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from mewpy.util.constants import ModelConstants
 from .analysis_utils import run_method_and_decode
 from .coregflux import CoRegFlux
+from .fba import FBA
+from .metabolic_analysis import single_gene_deletion, single_reaction_deletion, _run_jobs
 from .prom import PROM
 from .rfba import RFBA
 from .srfba import SRFBA
@@ -141,7 +143,8 @@ def ifva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
          objective: Union[str, Dict[str, float]] = None,
          constraints: Dict[str, Tuple[float, float]] = None,
          initial_state: Dict[str, float] = None,
-         method: str = 'srfba') -> pd.DataFrame:
+         method: str = 'srfba',
+         n_jobs: int = 1) -> pd.DataFrame:
     """
     Integrated Flux Variability Analysis (iFVA) of an integrated Metabolic-Regulatory model.
     iFVA is a flux variability analysis method that considers:
@@ -163,6 +166,7 @@ def ifva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
     :param constraints: additional constraints to be added to the model. If None, no additional constraints are added
     :param method: the method to be used for the simulation. Available methods: 'rfba', 'srfba'. Default: 'srfba'
     :param initial_state: the initial state of the model. If None, the default initial state is used (default: None)
+    :param n_jobs: the number of threads sharing the reactions, each with its own linear problem (default: 1)
     :return: a DataFrame with the results of the simulation
     """
     if not reactions:
@@ -182,22 +186,26 @@ def ifva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
 
     LP = INTEGRATED_ANALYSIS_METHODS[method]
 
-    _lp = LP(model).build()
-    objective_value, _ = run_method_and_decode(method=_lp, objective=objective, constraints=constraints,
+    # the objective and constraints of each optimization are temporary, so a single linear problem is built
+    # for both the optimal objective value and the reactions' variability
+    lp = LP(model).build()
+    objective_value, _ = run_method_and_decode(method=lp, objective=objective, constraints=constraints,
                                                initial_state=initial_state)
-    constraints[obj] = (fraction * objective_value, ModelConstants.REACTION_UPPER_BOUND)
+    constraints = {**constraints, obj: (fraction * objective_value, ModelConstants.REACTION_UPPER_BOUND)}
 
-    lp = LP(model).build()
+    reactions = list(reactions)
+    values = np.zeros((len(reactions), 2))
 
-    result = defaultdict(list)
-    for rxn in reactions:
-        min_val, _ = run_method_and_decode(method=lp, objective={rxn: 1.0}, constraints=constraints, minimize=True)
-        result[rxn].append(min_val)
+    def sweep(problem, chunk):
+        for i, rxn in chunk:
+            values[i, 0], _ = run_method_and_decode(method=problem, objective={rxn: 1.0}, constraints=constraints,
+                                                    minimize=True)
+            values[i, 1], _ = run_method_and_decode(method=problem, objective={rxn: 1.0}, constraints=constraints,
+                                                    minimize=False)
 
-        max_val, _ = run_method_and_decode(method=lp, objective={rxn: 1.0}, constraints=constraints, minimize=False)
-        result[rxn].append(max_val)
+    _run_jobs(method=lp, task=sweep, items=reactions, n_jobs=n_jobs)
 
-    return pd.DataFrame.from_dict(data=result, orient='index', columns=['minimum', 'maximum'])
+    return pd.DataFrame(values, index=reactions, columns=['minimum', 'maximum'])
 
 
 def isingle_gene_deletion(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
@@ -385,6 +393,7 @@ def _decode_interactions(model: Union['Model', 'MetabolicModel', 'RegulatoryMode
     """
     target_state = {}
     for interaction in model.yield_interactions():
+        target_id = interaction.target.id
 
         for coefficient, event in interaction.regulatory_events.items():
             if event.is_none:
@@ -392,10 +401,10 @@ def _decode_interactions(model: Union['Model', 'MetabolicModel', 'RegulatoryMode
 
             result = event.evaluate(state)
             if result:
-                target_state[interaction.target.id] = coefficient
+                target_state[target_id] = coefficient
 
             else:
-                target_state[interaction.target.id] = 0.0
+                target_state[target_id] = 0.0
 
     return target_state
 
@@ -468,7 +477,6 @@ def find_conflicts(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
         initial_state = initial_state.copy()
 
     # 1. it performs a FBA simulation to find the optimal growth rate
-    from mewpy.germ.analysis import FBA
     solution = FBA(model).build().optimize(solver_kwargs={'constraints': constraints})
 
     if not solution.objective_value:
@@ -476,11 +484,9 @@ def find_conflicts(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
                            'the metabolic model must be feasible.')
 
     # 2. it performs an essential genes analysis using FBA
-    from mewpy.germ.analysis.metabolic_analysis import single_gene_deletion
     gene_deletion = single_gene_deletion(model, constraints=constraints)
     essential_genes = gene_deletion[gene_deletion['growth'] < ModelConstants.TOLERANCE]
 
-    from mewpy.germ.analysis.metabolic_analysis import single_reaction_deletion
     reaction_deletion = single_reaction_deletion(model, constraints=constraints)
     essential_reactions = reaction_deletion[reaction_deletion['growth'] < ModelConstants.TOLERANCE]
 
@@ -1,17 +1,100 @@
 from collections import defaultdict
-from typing import Union, TYPE_CHECKING, Dict, Tuple, Sequence, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, TYPE_CHECKING, Dict, Tuple, Sequence, Optional, Callable, List, Any, FrozenSet
 
+import numpy as np
 import pandas as pd
 
 from mewpy.util.constants import ModelConstants
-from .analysis_utils import run_method_and_decode
+from .analysis_utils import run_method_and_decode, decode_solver_solution
 from .fba import FBA
 from .pfba import pFBA
 
 if TYPE_CHECKING:
+    from mewpy.germ.algebra import Symbolic
     from mewpy.germ.models import Model, MetabolicModel, RegulatoryModel
 
 
+def _gpr_clauses(symbolic: 'Symbolic', max_clauses: int = 256) -> Optional[List[FrozenSet[str]]]:
+    """
+    It expands a GPR rule into its disjunctive normal form. That is, a list of clauses (sets of genes),
+    so that the rule is active if all genes of any clause are active.
+
+    :param symbolic: the symbolic expression of the GPR rule
+    :param max_clauses: the maximum number of clauses of the expansion
+    :return: the list of clauses or None if the rule cannot be expanded (e.g. negations) or has too many clauses
+    """
+    if symbolic.is_symbol:
+        return [frozenset((symbolic.name,))]
+
+    # parsed rules represent the constants as numbers (One and Zero)
+    if symbolic.is_true or symbolic.is_one:
+        return [frozenset()]
+
+    if symbolic.is_false or symbolic.is_zero:
+        return []
+
+    if not symbolic.is_and and not symbolic.is_or:
+        return
+
+    children = [_gpr_clauses(child, max_clauses) for child in symbolic.variables]
+
+    if any(child is None for child in children):
+        return
+
+    if symbolic.is_or:
+        clauses = [clause for child in children for clause in child]
+
+    else:
+        clauses = [frozenset()]
+        for child in children:
+            clauses = [clause | child_clause for clause in clauses for child_clause in child]
+
+            if len(clauses) > max_clauses:
+                return
+
+    if len(clauses) > max_clauses:
+        return
+
+    return clauses
+
+
+def _run_jobs(method: FBA,
+              task: Callable[[FBA, List[Tuple[int, Any]]], None],
+              items: Sequence[Any],
+              n_jobs: int = 1):
+    """
+    It runs a task over the items, splitting them over n_jobs threads.
+    Linear problems are not thread-safe, so each thread has its own linear problem of the same method.
+    The additional linear problems are built here before starting the threads.
+    Solvers such as CPLEX and Gurobi release the GIL while solving, so the threads optimize in parallel
+    without copying the model to other processes.
+    Each linear problem is built once and kept warm for all items of its thread,
+    as temporary objectives and constraints are reverted by the solver after each optimization.
+
+    The task receives the items together with their positions, so that results can be written to preallocated arrays.
+
+    :param method: a built linear problem (e.g. FBA, RFBA or SRFBA) used by the first thread
+    :param task: a function of a linear problem and a chunk of (position, item) pairs
+    :param items: the items to be split over the threads
+    :param n_jobs: the number of threads. Default: 1
+    :return:
+    """
+    items = list(enumerate(items))
+
+    n_jobs = max(1, min(n_jobs, len(items)))
+
+    if n_jobs == 1:
+        task(method, items)
+        return
+
+    methods = [method] + [type(method)(method.model).build() for _ in range(n_jobs - 1)]
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        # consuming the results raises the exceptions of the threads
+        list(executor.map(task, methods, [items[i::n_jobs] for i in range(n_jobs)]))
+
+
 def slim_fba(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
              objective: Union[str, Dict[str, float]] = None,
              constraints: Dict[str, Tuple[float, float]] = None) -> Optional[float]:
@@ -71,7 +154,8 @@ def fva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
         fraction: float = 1.0,
         reactions: Sequence[str] = None,
         objective: Union[str, Dict[str, float]] = None,
-        constraints: Dict[str, Tuple[float, float]] = None) -> pd.DataFrame:
+        constraints: Dict[str, Tuple[float, float]] = None,
+        n_jobs: int = 1) -> pd.DataFrame:
     """
     Flux Variability Analysis (FVA) of a metabolic model.
     FVA is a method to determine the minimum and maximum fluxes for each reaction in a metabolic model.
@@ -84,6 +168,7 @@ def fva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
     :param reactions: the reactions to be simulated (default: all reactions in the model)
     :param objective: the objective function to be used for the simulation (default: the default objective)
     :param constraints: additional constraints to be used for the simulation (default: None)
+    :param n_jobs: the number of threads sharing the reactions, each with its own linear problem (default: 1)
     :return: a pandas DataFrame with the minimum and maximum fluxes for each reaction
     """
     if not reactions:
@@ -101,26 +186,30 @@ def fva(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
     else:
         obj = next(iter(model.objective)).id
 
-    _fba = FBA(model).build()
-    objective_value, _ = run_method_and_decode(method=_fba, objective=objective, constraints=constraints)
-    constraints[obj] = (fraction * objective_value, ModelConstants.REACTION_UPPER_BOUND)
-
     fba = FBA(model).build()
+    objective_value, _ = run_method_and_decode(method=fba, objective=objective, constraints=constraints)
+    constraints = {**constraints, obj: (fraction * objective_value, ModelConstants.REACTION_UPPER_BOUND)}
+
+    reactions = list(reactions)
+    values = np.zeros((len(reactions), 2))
 
-    result = defaultdict(list)
-    for rxn in reactions:
-        min_val, _ = run_method_and_decode(method=fba, objective={rxn: 1.0}, constraints=constraints, minimize=True)
-        result[rxn].append(min_val)
+    def sweep(method, chunk):
+        # all reactions are minimized first and then maximized. Consecutive solves share the same objective sense,
+        # so that the solver can warm-start each one from the previous basis
+        for column, minimize in enumerate((True, False)):
+            for i, rxn in chunk:
+                values[i, column], _ = run_method_and_decode(method=method, objective={rxn: 1.0},
+                                                             constraints=constraints, minimize=minimize)
 
-        max_val, _ = run_method_and_decode(method=fba, objective={rxn: 1.0}, constraints=constraints, minimize=False)
-        result[rxn].append(max_val)
+    _run_jobs(method=fba, task=sweep, items=reactions, n_jobs=n_jobs)
 
-    return pd.DataFrame.from_dict(data=result, orient='index', columns=['minimum', 'maximum'])
+    return pd.DataFrame(values, index=reactions, columns=['minimum', 'maximum'])
 
 
 def single_gene_deletion(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
                          genes: Sequence[str] = None,
-                         constraints: Dict[str, Tuple[float, float]] = None) -> pd.DataFrame:
+                         constraints: Dict[str, Tuple[float, float]] = None,
+                         n_jobs: int = 1) -> pd.DataFrame:
     """
     Single gene deletion analysis of a metabolic model.
     Single gene deletion analysis is a method to determine the effect of deleting each gene in a metabolic model.
@@ -131,55 +220,117 @@ def single_gene_deletion(model: Union['Model', 'MetabolicModel', 'RegulatoryMode
     :param model: a metabolic model to be simulated
     :param genes: the genes to be simulated (default: all genes in the model)
     :param constraints: additional constraints to be used for the simulation (default: None)
+    :param n_jobs: the number of threads sharing the genes, each with its own linear problem (default: 1)
     :return: a pandas DataFrame with the fluxes for each gene
     """
     if not constraints:
         constraints = {}
 
     if not genes:
-        genes = model.yield_genes()
+        genes = list(model.yield_genes())
     else:
         genes = [model.genes[gene] for gene in genes if gene in model.genes]
 
     fba = FBA(model).build()
     wt_objective_value, wt_status = run_method_and_decode(method=fba, constraints=constraints)
 
-    state = {gene.id: max(gene.coefficients) for gene in model.yield_genes()}
+    # only the reactions of the deleted genes and the genes of their GPR rules are required,
+    # so that the wild-type state is not built for all genes when deleting a few genes
+    reactions = {reaction.id: reaction for gene in genes for reaction in gene.yield_reactions()}
 
-    result = {}
-    for gene in genes:
+    initial_state = {gene.id: max(gene.coefficients)
+                     for reaction in reactions.values() for gene in reaction.yield_genes()}
 
-        gene_coefficient = state.pop(gene.id, 0.0)
-        state[gene.id] = 0.0
+    # The reactions switched off by each gene knockout are found once from the GPR rules in disjunctive normal form.
+    # A knockout switches off a reaction if the gene belongs to all clauses active in the wild-type.
+    # GPR rules that cannot be expanded are evaluated for each knockout instead
+    knockouts_by_gene = defaultdict(list)
+    wt_gpr = {}
+    for reaction in reactions.values():
+        gpr = reaction.gpr
 
-        gene_constraints = {}
-        for reaction in gene.yield_reactions():
+        if gpr.is_none:
+            continue
 
-            if reaction.gpr.is_none:
-                continue
+        clauses = _gpr_clauses(gpr.symbolic)
 
-            gpr_eval = reaction.gpr.evaluate(values=state)
+        if clauses is None or any(initial_state.get(gene) not in (0, 1) for clause in clauses for gene in clause):
+            wt_gpr[reaction.id] = gpr.evaluate(values=initial_state)
+            continue
 
-            if gpr_eval:
-                continue
+        active = [clause for clause in clauses if all(initial_state[gene] for gene in clause)]
 
-            gene_constraints[reaction.id] = (0.0, 0.0)
+        if active:
+            essential = frozenset.intersection(*active)
 
-        if gene_constraints:
-            solution, status = run_method_and_decode(method=fba, constraints={**constraints, **gene_constraints})
-            result[gene.id] = [solution, status]
+        elif reaction.id in constraints:
+            # a reaction switched off in the wild-type is only constrained again
+            # if the constraints override its bounds
+            essential = frozenset().union(*clauses)
 
         else:
-            result[gene.id] = [float(wt_objective_value), str(wt_status)]
+            continue
+
+        for gene in essential:
+            knockouts_by_gene[gene].append(reaction.id)
+
+    def sweep(method, chunk):
+        # each thread switches off genes in its own copy of the state
+        state = initial_state.copy()
+
+        # the knockout constraints of all genes are computed first
+        knockouts = {}
+        for i, gene in chunk:
+
+            gene_constraints = {reaction: (0.0, 0.0) for reaction in knockouts_by_gene.get(gene.id, ())}
+
+            gene_coefficient = state.pop(gene.id, 0.0)
+            state[gene.id] = 0.0
+
+            for reaction in gene.yield_reactions():
+
+                if reaction.id not in wt_gpr:
+                    continue
+
+                # a reaction switched off in the wild-type cannot be switched off by a gene knockout
+                if not wt_gpr[reaction.id] and reaction.id not in constraints:
+                    continue
+
+                gpr_eval = reaction.gpr.evaluate(values=state)
+
+                if gpr_eval:
+                    continue
 
-        state[gene.id] = gene_coefficient
+                gene_constraints[reaction.id] = (0.0, 0.0)
 
-    return pd.DataFrame.from_dict(data=result, orient='index', columns=['growth', 'status'])
+            if gene_constraints:
+                knockouts[i] = gene_constraints
+
+            else:
+                growth[i] = wt_objective_value
+                status[i] = str(wt_status)
+
+            state[gene.id] = gene_coefficient
+
+        # and then all knockouts are solved in a single batch, which the solver may optimize
+        solutions = method.solver.solve_batch(list(knockouts.values()), base_constraints=constraints,
+                                              **method._solver_kwargs({'get_values': False}))
+
+        for i, solution in zip(knockouts, solutions):
+            growth[i], status[i] = decode_solver_solution(solution=solution)
+
+    growth = np.zeros(len(genes))
+    status = np.empty(len(genes), dtype=object)
+
+    _run_jobs(method=fba, task=sweep, items=genes, n_jobs=n_jobs)
+
+    return pd.DataFrame({'growth': growth, 'status': status}, index=[gene.id for gene in genes])
 
 
 def single_reaction_deletion(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
                              reactions: Sequence[str] = None,
-                             constraints: Dict[str, Tuple[float, float]] = None) -> pd.DataFrame:
+                             constraints: Dict[str, Tuple[float, float]] = None,
+                             n_jobs: int = 1) -> pd.DataFrame:
     """
     Single reaction deletion analysis of a metabolic model.
     Single reaction deletion analysis is a method to determine the effect of deleting each reaction
@@ -190,6 +341,7 @@ def single_reaction_deletion(model: Union['Model', 'MetabolicModel', 'Regulatory
     :param model: a metabolic model to be simulated
     :param reactions: the reactions to be simulated (default: all reactions in the model)
     :param constraints: additional constraints to be used for the simulation (default: None)
+    :param n_jobs: the number of threads sharing the reactions, each with its own linear problem (default: 1)
     :return: a pandas DataFrame with the fluxes for each reaction
     """
     if not reactions:
@@ -200,10 +352,25 @@ def single_reaction_deletion(model: Union['Model', 'MetabolicModel', 'Regulatory
 
     fba = FBA(model).build()
 
-    result = {}
-    for reaction in reactions:
-        reaction_constraints = {reaction: (0.0, 0.0)}
-        solution, status = run_method_and_decode(method=fba, constraints={**constraints, **reaction_constraints})
-        result[reaction] = [solution, status]
+    def sweep(method, chunk):
+        # the knockout is set in a single copy of the constraints and then restored,
+        # rather than merging all constraints for every reaction
+        merged = dict(constraints)
+
+        for i, reaction in chunk:
+            merged[reaction] = (0.0, 0.0)
+
+            growth[i], status[i] = run_method_and_decode(method=method, constraints=merged)
+
+            if reaction in constraints:
+                merged[reaction] = constraints[reaction]
+            else:
+                del merged[reaction]
+
+    reactions = list(reactions)
+    growth = np.zeros(len(reactions))
+    status = np.empty(len(reactions), dtype=object)
+
+    _run_jobs(method=fba, task=sweep, items=reactions, n_jobs=n_jobs)
 
-    return pd.DataFrame.from_dict(data=result, orient='index', columns=['growth', 'status'])
+    return pd.DataFrame({'growth': growth, 'status': status}, index=reactions)
@@ -1,4 +1,4 @@
-from typing import Union, Dict
+from typing import Union, Dict, Optional, Tuple
 
 from mewpy.germ.analysis import FBA
 from mewpy.germ.lp import ConstraintContainer, VariableContainer
@@ -8,6 +8,7 @@ from mewpy.solvers.solver import VarType, Solver
 
 
 class pFBA(FBA):
+    __slots__ = ('_split_template', '_fixed_variable', '_fixed_coef', '_wt_fba', '_wt_objective')
 
     def __init__(self,
                  model: Union[Model, MetabolicModel, RegulatoryModel],
@@ -33,26 +34,91 @@ class pFBA(FBA):
         :param build: Whether to build the linear problem upon instantiation. Default: False
         :param attach: Whether to attach the linear problem to the model upon instantiation. Default: False
         """
+        # irreversible split of the model reactions, computed once per build
+        self._split_template = None
+
+        # original variable of the objective reaction whose bounds are fixed to the wild-type objective value
+        self._fixed_variable = None
+        self._fixed_coef = None
+
+        # FBA linear problem of the wild-type objective value, which is reused across optimizations
+        self._wt_fba = None
+
+        # status and objective value of the wild-type FBA without temporary constraints
+        self._wt_objective = None
+
         super().__init__(model=model, solver=solver, build=build, attach=attach)
 
+    def _get_split_template(self):
+        """
+        It returns the irreversible split of the model reactions. The split is cached until the linear problem is
+        built again, so that the pfba constraints can be replaced and restored without walking all reactions.
+        :return: a list of tuples (reaction id, forward id, reverse id, bounds) for the reversible reactions
+        and the minimization objective
+        """
+        if self._split_template is None:
+            reversible = []
+            objective = {}
+            for reaction in self.model.yield_reactions():
+
+                if reaction.reversibility:
+                    rxn_forward = f'{reaction.id}_forward'
+                    rxn_reverse = f'{reaction.id}_reverse'
+
+                    reversible.append((reaction.id, rxn_forward, rxn_reverse, reaction.bounds))
+
+                    objective[rxn_forward] = 1
+                    objective[rxn_reverse] = 1
+
+                else:
+                    objective[reaction.id] = 1
+
+            self._split_template = (reversible, objective)
+
+        return self._split_template
+
     def _wt_bounds(self, fraction: float = None, solver_kwargs: Dict = None):
         """
-        It builds the linear problem from the model. The linear problem is built from the model
-        variables and constraints. The linear problem is then loaded into the solver.
-        :return:
+        It returns the bounds of the wild-type objective value, which are used to fix the objective reaction
+        in the pfba problem. The wild-type objective value is computed with an FBA of the model.
+        The status and objective value of the wild-type FBA are cached unless the solver arguments may change them.
+        :param fraction: the fraction of the wild-type objective value used as lower bound. Default: None (the lower
+        bound is the wild-type objective value)
+        :param solver_kwargs: A dictionary of keyword arguments to be passed to the solver.
+        :return: the lower and upper bounds of the wild-type objective value
         """
         if not solver_kwargs:
             solver_kwargs = {}
 
-        sol = FBA(model=self.model, build=True, attach=False).optimize(solver_kwargs=solver_kwargs, to_solver=True)
-        if sol.status != Status.OPTIMAL:
+        # the wild-type objective value is only cached if the solver arguments do not change the problem,
+        # objective or direction (e.g. constraints, linear, quadratic or minimize)
+        cache = all(key in ('get_values', 'shadow_prices', 'reduced_costs') or value is None
+                    or (key == 'constraints' and not value)
+                    for key, value in solver_kwargs.items())
+
+        if cache and self._wt_objective is not None:
+            status, fobj = self._wt_objective
+
+        else:
+            # the solver of the wild-type FBA keeps its basis between optimizations,
+            # so that the next optimization is warm-started
+            if self._wt_fba is None:
+                self._wt_fba = FBA(model=self.model, build=True, attach=False)
+
+            sol = self._wt_fba.optimize(solver_kwargs=solver_kwargs, to_solver=True)
+            status, fobj = sol.status, sol.fobj
+
+            if cache:
+                self._wt_objective = (status, fobj)
+
+        if status != Status.OPTIMAL:
             lb, ub = 0.0, 0.0
 
         else:
             if fraction is None:
-                lb, ub = float(sol.fobj), float(sol.fobj)
+                lb, ub = float(fobj), float(fobj)
             else:
-                lb, ub = float(sol.fobj) * fraction, float(sol.fobj)
+                lb, ub = float(fobj) * fraction, float(fobj)
         return lb, ub
 
     def _build_pfba_constrains(self, fraction: float = None, solver_kwargs: Dict = None):
@@ -65,46 +131,61 @@ class pFBA(FBA):
 
         lb, ub = self._wt_bounds(fraction, solver_kwargs)
 
+        # the coefficients are copied when the constraint is added to the linear problem,
+        # and the constraints are only read, so the solver arguments do not need to be copied
         if 'linear' in solver_kwargs:
-            coef = solver_kwargs['linear'].copy()
+            coef = solver_kwargs['linear']
         else:
-            coef = {variable.id: val for variable, val in self.model.objective.items()}
+            coef = self._get_model_objective()
 
-        if 'constraints' in solver_kwargs:
-            constraints = solver_kwargs['constraints'].copy()
-        else:
-            constraints = {}
+        constraints = solver_kwargs.get('constraints', {})
 
-        constraint = ConstraintContainer(name='pfba_constraints', coefs=[coef], lbs=[lb], ubs=[ub])
-        variable = VariableContainer(name='pfba_variables', sub_variables=[], lbs=[], ubs=[], variables_type=[])
-        objective = {}
-        for reaction in self.model.yield_reactions():
+        # restore the bounds of the objective reaction fixed in a previous build of the pfba constraints
+        if self._fixed_variable is not None:
+            self.add_variables(self._fixed_variable)
+            self._fixed_variable = None
+
+        # an objective with a single reaction is fixed by tightening the bounds of the reaction,
+        # which avoids an additional row in the linear problem. Otherwise, a constraint is added.
+        # The constraint is also used if the solver arguments override the bounds of the objective reaction
+        rxn_id, rxn_coef = next(iter(coef.items())) if len(coef) == 1 else (None, 0)
 
-            if reaction.reversibility:
-                rxn_forward = f'{reaction.id}_forward'
-                rxn_reverse = f'{reaction.id}_reverse'
+        if rxn_coef and rxn_id in self._variables and rxn_id not in constraints:
+            self._fixed_variable = self._variables[rxn_id]
+            self._fixed_coef = rxn_coef
 
-                rxn_ub = float(constraints.get(reaction.id, reaction.bounds)[1])
+            rxn_lb, rxn_ub = sorted((lb / rxn_coef, ub / rxn_coef))
+            self.add_variables(VariableContainer(name=rxn_id, sub_variables=[rxn_id],
+                                                 lbs=[rxn_lb], ubs=[rxn_ub], variables_type=[VarType.CONTINUOUS]))
 
-                variable.sub_variables.extend([rxn_forward, rxn_reverse])
-                variable.lbs.extend([0.0, 0.0])
-                variable.ubs.extend([rxn_ub, rxn_ub])
-                variable.variables_type.extend([VarType.CONTINUOUS, VarType.CONTINUOUS])
+            constraint = ConstraintContainer(name='pfba_constraints', coefs=[], lbs=[], ubs=[])
 
-                constraint.lbs.extend([0.0, 0.0])
-                constraint.ubs.extend([rxn_ub, rxn_ub])
-                constraint.coefs.extend([{reaction.id: -1, rxn_forward: 1},
-                                         {reaction.id: 1, rxn_reverse: 1}])
+        else:
+            constraint = ConstraintContainer(name='pfba_constraints', coefs=[coef], lbs=[lb], ubs=[ub])
+
+        variable = VariableContainer(name='pfba_variables', sub_variables=[], lbs=[], ubs=[], variables_type=[])
 
-                objective[rxn_forward] = 1
-                objective[rxn_reverse] = 1
+        reversible, objective = self._get_split_template()
+        for rxn_id, rxn_forward, rxn_reverse, rxn_bounds in reversible:
+            rxn_ub = float(constraints.get(rxn_id, rxn_bounds)[1])
 
-            else:
-                objective[reaction.id] = 1
+            variable.sub_variables.extend([rxn_forward, rxn_reverse])
+            variable.lbs.extend([0.0, 0.0])
+            variable.ubs.extend([rxn_ub, rxn_ub])
+            variable.variables_type.extend([VarType.CONTINUOUS, VarType.CONTINUOUS])
+
+            constraint.lbs.extend([0.0, 0.0])
+            constraint.ubs.extend([rxn_ub, rxn_ub])
+            constraint.coefs.extend([{rxn_id: -1, rxn_forward: 1},
+                                     {rxn_id: 1, rxn_reverse: 1}])
+
+        # models without reversible reactions (e.g. irreversible models) do not need the split variables.
+        # The split is fixed until the next build, so the container is never left behind
+        if reversible:
+            self.add_variables(variable)
 
-        self.add_variables(variable)
         self.add_constraints(constraint)
-        self._linear_objective = objective
+        self._linear_objective = dict(objective)
         self._minimize = True
 
     def _build(self):
@@ -113,7 +194,13 @@ class pFBA(FBA):
         variables and constraints. The linear problem is then loaded into the solver.
         :return:
         """
-        if self.model.is_metabolic():
+        # the model might have changed since the last build
+        self._split_template = None
+        self._fixed_variable = None
+        self._wt_fba = None
+        self._wt_objective = None
+
+        if self._is_model_type('metabolic'):
             # mass balance constraints and reactions' variables
             self._build_mass_constraints()
 
@@ -122,6 +209,61 @@ class pFBA(FBA):
 
         return
 
+    def _pfba_bounds(self,
+                     fraction: float = None,
+                     solver_kwargs: Dict = None) -> Optional[Dict[str, Tuple[float, float]]]:
+        """
+        It returns the constraints of the solver arguments together with the bounds of the objective reaction and
+        split variables required by these constraints and the fraction of the wild-type objective value.
+        The bounds can only replace the pfba constraints if the objective reaction is fixed by its bounds and
+        the constraints do not relax the upper bounds of the split reactions.
+        Otherwise, the pfba constraints must be built again.
+        :param fraction: The fraction of the wild-type objective value to be used as lower bound of the objective
+        :param solver_kwargs: A dictionary of keyword arguments to be passed to the solver.
+        :return: A dictionary of bounds or None if the pfba constraints must be built again.
+        """
+        constraints = solver_kwargs.get('constraints') or {}
+
+        if self._fixed_variable is None or self._fixed_variable.name in constraints:
+            return
+
+        bounds = dict(constraints)
+
+        reversible, _ = self._get_split_template()
+        for rxn_id, rxn_forward, rxn_reverse, rxn_bounds in reversible:
+            if rxn_id not in constraints:
+                continue
+
+            rxn_ub = float(constraints[rxn_id][1])
+
+            # the splitting rows are bounded by the upper bound of the reaction at build time
+            if rxn_ub > rxn_bounds[1]:
+                return
+
+            bounds[rxn_forward] = (0.0, rxn_ub)
+            bounds[rxn_reverse] = (0.0, rxn_ub)
+
+        lb, ub = self._wt_bounds(fraction=fraction, solver_kwargs=solver_kwargs)
+        bounds[self._fixed_variable.name] = tuple(sorted((lb / self._fixed_coef, ub / self._fixed_coef)))
+        return bounds
+
+    def _drop_split_values(self, solution: Solution) -> Solution:
+        """
+        It removes the values of the split variables from the solver solution. The fluxes of the reversible
+        reactions are already given by the reactions' variables. The split variables are known from the split
+        template, so no variable name has to be inspected.
+        :param solution: A Solution instance.
+        :return: The Solution instance without the values of the split variables.
+        """
+        values = solution.values
+        if values:
+            reversible, _ = self._get_split_template()
+            for _, rxn_forward, rxn_reverse, _ in reversible:
+                values.pop(rxn_forward, None)
+                values.pop(rxn_reverse, None)
+
+        return solution
+
     def _optimize(self, fraction: float = None, solver_kwargs: Dict = None, **kwargs) -> Solution:
         """
         It optimizes the linear problem. The linear problem is solved by the solver interface.
@@ -134,18 +276,26 @@ class pFBA(FBA):
         linear = solver_kwargs.get('linear')
         constraints = solver_kwargs.get('constraints')
 
+        if linear is None and (fraction is not None or constraints):
+            bounds = self._pfba_bounds(fraction=fraction, solver_kwargs=solver_kwargs)
+
+            if bounds is not None:
+                # the pfba constraints only differ in bounds, which are set temporarily in the current solver.
+                # The solver is not rebuilt, so that the optimization is warm-started from the previous basis
+                return self._drop_split_values(self.solver.solve(**self._solver_kwargs({**solver_kwargs, 'constraints': bounds})))
+
         # if linear and constraints are not provided, build new pfba constraints and solver
         replace_pfba_constraints = [x for x in (fraction, linear, constraints) if x is not None]
 
         if replace_pfba_constraints:
-            self._build_pfba_constrains(solver_kwargs=solver_kwargs)
+            self._build_pfba_constrains(fraction=fraction, solver_kwargs=solver_kwargs)
             self.build_solver()
 
-        solution = self.solver.solve(**solver_kwargs)
+        solution = self.solver.solve(**self._solver_kwargs(solver_kwargs))
 
         # restore the pfba constraints and solver to the previous state
         if replace_pfba_constraints:
             self._build_pfba_constrains()
             self.build_solver()
 
-        return solution
+        return self._drop_split_values(solution)
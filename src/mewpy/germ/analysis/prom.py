@@ -1,5 +1,7 @@
-from typing import Union, Dict, TYPE_CHECKING, Any, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Dict, TYPE_CHECKING, Any, Sequence, Tuple, List
 
+import numpy as np
 import pandas as pd
 
 from mewpy.germ.analysis import FBA
@@ -13,19 +15,8 @@ if TYPE_CHECKING:
     from mewpy.germ.models import Model, MetabolicModel, RegulatoryModel
 
 
-def _run_and_decode_solver(lp,
-                           additional_constraints: Dict[str, Tuple[float, float]] = None,
-                           **kwargs):
-    if not additional_constraints:
-        additional_constraints = {}
-
-    if not kwargs:
-        kwargs = {}
-
-    if 'constraints' in kwargs:
-        kwargs['constraints'].update(additional_constraints)
-
-    solution = lp.solver.solve(**kwargs)
+def _run_and_decode_solver(lp, **kwargs):
+    solution = lp.solver.solve(**lp._solver_kwargs(kwargs))
     if solution.status == Status.OPTIMAL:
         return solution.fobj
     else:
@@ -33,6 +24,7 @@ def _run_and_decode_solver(lp,
 
 
 class PROM(FBA):
+    __slots__ = ()
 
     def __init__(self,
                  model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
@@ -60,46 +52,86 @@ class PROM(FBA):
         :return:
         """
         self._build_mass_constraints()
-        self._linear_objective = {var.id: value for var, value in self.model.objective.items()}
+        self._linear_objective = self._get_model_objective()
         self._minimize = False
 
-    def _max_rates(self, solver_kwargs: Dict[str, Any]):
-        # wt-type reference
-        reference = self.solver.solve(**solver_kwargs)
-        if reference.status != Status.OPTIMAL:
-            raise RuntimeError('The solver did not find an optimal solution for the wild-type conditions.')
-        reference = reference.values.copy()
-        reference_constraints = {key: (reference[key] * 0.99, reference[key])
+    def _reaction_bounds(self) -> Dict[str, Tuple[float, float]]:
+        """
+        It returns the bounds of the reactions in the linear problem. These are the bounds of the model reactions
+        when the problem was last built, and reactions switched off by their GPR rules are bounded to zero.
+        The wild-type reference, the maximum rates and the knockouts are all computed with these bounds, so that
+        changes to the model bounds only take effect once the problem is built again (or attached to the model).
+        :return: a dictionary of reaction identifier and bounds
+        """
+        variables = self._variables
+        return {reaction.id: (variables[reaction.id].lbs[0], variables[reaction.id].ubs[0])
+                for reaction in self.model.yield_reactions()}
+
+    def _max_rates(self,
+                   reference: Dict[str, float],
+                   solver_kwargs: Dict[str, Any],
+                   bounds: Dict[str, Tuple[float, float]] = None,
+                   fraction: float = 0.99):
+        # the wild-type reference is solved once in _optimize. The solver keeps its basis,
+        # so that the fva below is warm-started from the wild-type solution.
+        # The objective is bounded by a fraction of the wild-type reference, which is the same for all reactions
+        reference_constraints = {key: (reference[key] * fraction, reference[key])
                                  for key in self._linear_objective}
 
-        # fva of the reaction at fraction of 0.99 (for wild-type growth rate)
-        rates = {}
-        for reaction in self.model.reactions:
-            min_rxn = _run_and_decode_solver(self,
-                                             additional_constraints=reference_constraints,
-                                             **{**solver_kwargs,
-                                                'get_values': False,
-                                                'linear': {reaction: 1},
-                                                'minimize': True})
-            max_rxn = _run_and_decode_solver(self,
-                                             additional_constraints=reference_constraints,
-                                             **{**solver_kwargs,
-                                                'get_values': False,
-                                                'linear': {reaction: 1},
-                                                'minimize': False})
+        # the solver constraints are merged with the reference constraints once, as only the objective and
+        # direction change between the fva solves
+        constraints = {**solver_kwargs.get('constraints', {}), **reference_constraints}
+
+        if bounds is None:
+            bounds = self._reaction_bounds()
+
+        tolerance = ModelConstants.TOLERANCE
+
+        # fva of the reaction at fraction of the wild-type growth rate (0.99 by default).
+        # All reactions are minimized first and then maximized, as the optimal basis of a minimization
+        # is closer to the one of the next minimization than to the one of the maximization.
+        # The rate of a reaction carrying a negative (positive) wild-type flux is its minimum (maximum), so the
+        # other direction is not solved. If the wild-type flux is already at the bound, no lp is solved
+        reactions = list(self.model.reactions)
+        min_rates = {}
+        max_rates = {}
+        for minimize, rxn_rates in ((True, min_rates), (False, max_rates)):
+            for reaction in reactions:
+                reference_rate = reference[reaction]
+
+                if minimize and reference_rate > 0 or not minimize and reference_rate < 0:
+                    continue
+
+                rxn_lb, rxn_ub = constraints.get(reaction, bounds[reaction])
+                if minimize and reference_rate < 0 and reference_rate <= rxn_lb:
+                    rxn_rates[reaction] = reference_rate
+                    continue
 
+                if not minimize and reference_rate > 0 and reference_rate >= rxn_ub:
+                    rxn_rates[reaction] = reference_rate
+                    continue
+
+                rxn_rates[reaction] = _run_and_decode_solver(self,
+                                                             **{**solver_kwargs,
+                                                                'constraints': constraints,
+                                                                'get_values': False,
+                                                                'linear': {reaction: 1},
+                                                                'minimize': minimize})
+
+        rates = {}
+        for reaction in reactions:
             reference_rate = reference[reaction]
 
             if reference_rate < 0:
-                value = min((min_rxn, max_rxn, reference_rate))
+                value = min((min_rates[reaction], reference_rate))
 
             elif reference_rate > 0:
-                value = max((min_rxn, max_rxn, reference_rate))
+                value = max((max_rates[reaction], reference_rate))
 
             else:
-                value = max((abs(min_rxn), abs(max_rxn), abs(reference_rate)))
+                value = max((abs(min_rates[reaction]), abs(max_rates[reaction]), abs(reference_rate)))
 
-            if abs(value) < ModelConstants.TOLERANCE:
+            if abs(value) < tolerance:
                 value = 0.0
 
             rates[reaction] = value
@@ -111,51 +143,73 @@ class PROM(FBA):
                      regulator: Union['Gene', 'Regulator'],
                      reference: Dict[str, float],
                      max_rates: Dict[str, float],
+                     bounds: Dict[str, Tuple[float, float]] = None,
+                     gpr_cache: Dict[Tuple[str, frozenset], bool] = None,
                      to_solver: bool = False,
                      solver_kwargs: Dict[str, Any] = None):
         solver_constrains = solver_kwargs.get('constraints', {})
+        tolerance = ModelConstants.TOLERANCE
 
-        prom_constraints = {reaction.id: reaction.bounds for reaction in self.model.yield_reactions()}
-        state = {gene: 1 for gene in self.model.genes.keys()}
+        if bounds is None:
+            bounds = self._reaction_bounds()
+
+        if gpr_cache is None:
+            gpr_cache = {}
+
+        # the variables of the linear problem are already bounded by these bounds, so only the bounds changed
+        # by the knockout are passed to the solver. Solver constraints of reactions are replaced by these bounds
+        prom_constraints = {key: bounds.get(key, value) for key, value in solver_constrains.items()}
+
+        # only the target genes of the regulator are switched off. The remaining genes are active,
+        # as missing genes take the value 1 during the GPR evaluation
+        state = {}
 
         # if the regulator to be ko is a metabolic gene, the associated reactions are ko too
         # prom constraints of the associated reactions are set to threshold
         if regulator.is_gene():
 
             for reaction in regulator.reactions.keys():
-                prom_constraints[reaction] = (-ModelConstants.TOLERANCE, ModelConstants.TOLERANCE)
+                prom_constraints[reaction] = (-tolerance, tolerance)
 
         # finds the target genes of the deleted regulator.
+        # The targets are walked once and reused for the probability update below
+        targets = [target for target in regulator.yield_targets() if target.is_gene()]
+
         # finds the reactions associated with these target genes.
         # The reactions' bounds might be changed next, but for now the flag is set to False
         target_reactions = {}
-        for target in regulator.yield_targets():
+        for target in targets:
+            # after the regulator ko iteration, this is reset
+            state[target.id] = 0
 
-            if target.is_gene():
-                # after the regulator ko iteration, this is reset
-                state[target.id] = 0
-
-                target_reactions.update({reaction.id: reaction for reaction in target.yield_reactions()})
+            target_reactions.update({reaction.id: reaction for reaction in target.yield_reactions()})
 
         # GPR evaluation of each reaction previously found, but using the changed gene_state.
         # If the GPR is evaluated to zero, the reaction bounds will be changed in the future.
         # For that, the reactions dictionary flags must be updated to True.
+        # The evaluation only depends on the genes of the GPR that are switched off, so it is cached
+        # for the regulators sharing these genes
         inactive_reactions = {}
         for reaction in target_reactions.values():
 
-            if reaction.gpr.is_none:
+            gpr = reaction.gpr
+            if gpr.is_none:
                 continue
 
-            if reaction.gpr.evaluate(values=state):
+            key = (reaction.id, frozenset(gene for gene in gpr.variables if gene in state))
+            is_active = gpr_cache.get(key)
+            if is_active is None:
+                is_active = bool(gpr.evaluate(values=state, missing_value=1))
+                gpr_cache[key] = is_active
+
+            if is_active:
                 continue
 
             inactive_reactions[reaction.id] = reaction
 
-        # for each target regulated by the regulator
-        for target in regulator.yield_targets():
-
-            if not target.is_gene():
-                continue
+        # for each target regulated by the regulator.
+        # If no reaction is inactive, no bounds are changed by PROM
+        for target in (targets if inactive_reactions else ()):
 
             target: Union['Target', 'Gene']
 
@@ -167,22 +221,23 @@ class PROM(FBA):
 
             interaction_probability = probabilities[target_regulator]
 
+            # the reaction bounds are only changed using PROM probability if the probability is inferior to 1,
+            # otherwise nothing is changed
+            if interaction_probability >= 1:
+                continue
+
             # for each reaction associated with this single target
             for reaction in target.yield_reactions():
 
                 # if the gpr has been evaluated previously to zero,
                 # it means that the metabolic genes regulated by this regulator can affect the state of the
                 # reaction. Thus, the reaction bounds can be changed using PROM probability.
-                # Nevertheless, it is only useful to do that if the probability is inferior to 1, otherwise
-                # nothing is changed
                 if reaction.id not in inactive_reactions:
                     continue
 
-                if interaction_probability >= 1:
-                    continue
-
-                # reaction old bounds
-                rxn_lb, rxn_ub = tuple(prom_constraints[reaction.id])
+                # reaction original and old bounds
+                reaction_lb, reaction_ub = bounds[reaction.id]
+                rxn_lb, rxn_ub = prom_constraints.get(reaction.id, (reaction_lb, reaction_ub))
 
                 # probability flux is the upper or lower bound that this reaction can take
                 # when the regulator is KO. This is calculated as follows:
@@ -195,13 +250,11 @@ class PROM(FBA):
                 # update flux bounds according to probability flux
                 if wt_flux < 0:
 
-                    rxn_lb = max((reaction.lower_bound, probability_flux, rxn_lb))
-                    rxn_lb = min((rxn_lb, -ModelConstants.TOLERANCE))
+                    rxn_lb = min(max(reaction_lb, probability_flux, rxn_lb), -tolerance)
 
                 elif wt_flux > 0:
 
-                    rxn_ub = min((reaction.upper_bound, probability_flux, rxn_ub))
-                    rxn_ub = max((rxn_ub, ModelConstants.TOLERANCE))
+                    rxn_ub = max(min(reaction_ub, probability_flux, rxn_ub), tolerance)
 
                 else:
 
@@ -212,9 +265,9 @@ class PROM(FBA):
 
                 prom_constraints[reaction.id] = (rxn_lb, rxn_ub)
 
-        solution = self.solver.solve(**{**solver_kwargs,
-                                        'get_values': True,
-                                        'constraints': {**solver_constrains, **prom_constraints}})
+        solution = self.solver.solve(**self._solver_kwargs({**solver_kwargs,
+                                                            'get_values': True,
+                                                            'constraints': prom_constraints}))
 
         if to_solver:
             return solution
@@ -227,16 +280,23 @@ class PROM(FBA):
                   initial_state: Dict[Tuple[str, str], float] = None,
                   regulators: Sequence[Union['Gene', 'Regulator']] = None,
                   to_solver: bool = False,
-                  solver_kwargs: Dict[str, Any] = None) -> Union[Dict[str, Solution], Dict[str, ModelSolution]]:
+                  solver_kwargs: Dict[str, Any] = None,
+                  n_jobs: int = 1) -> Union[Dict[str, Solution], Dict[str, ModelSolution]]:
         # wild-type reference
         solver_kwargs['get_values'] = True
-        reference = self.solver.solve(**solver_kwargs)
+        reference = self.solver.solve(**self._solver_kwargs(solver_kwargs))
         if reference.status != Status.OPTIMAL:
             raise RuntimeError('The solver did not find an optimal solution for the wild-type conditions.')
         reference = reference.values.copy()
 
+        # the bounds of the reactions are read once from the linear problem for the fva and all regulator knockouts
+        bounds = self._reaction_bounds()
+
         # max and min fluxes of the reactions
-        max_rates = self._max_rates(solver_kwargs=solver_kwargs)
+        max_rates = self._max_rates(reference=reference, solver_kwargs=solver_kwargs, bounds=bounds)
+
+        # GPR evaluations shared by all regulator knockouts
+        gpr_cache = {}
 
         # a single regulator knockout
         if len(regulators) == 1:
@@ -244,32 +304,79 @@ class PROM(FBA):
                                      regulator=regulators[0],
                                      reference=reference,
                                      max_rates=max_rates,
+                                     bounds=bounds,
+                                     gpr_cache=gpr_cache,
                                      to_solver=to_solver,
                                      solver_kwargs=solver_kwargs)
 
         # multiple regulator knockouts
-        kos = {}
-        for regulator in regulators:
-            ko_solution = self._optimize_ko(probabilities=initial_state,
-                                            regulator=regulator,
-                                            reference=reference,
-                                            max_rates=max_rates,
-                                            to_solver=to_solver,
-                                            solver_kwargs=solver_kwargs)
-            kos[regulator.id] = ko_solution
-        return kos
+        n_jobs = max(1, min(n_jobs, len(regulators)))
+
+        # linear problems are not thread-safe, so each worker gets its own.
+        # They are built here, as building reads the model.
+        # The wild-type reference and maximum rates are shared by all workers
+        problems = [self]
+        problems_kwargs = [solver_kwargs]
+        for _ in range(n_jobs - 1):
+            solver = self._initial_solver
+            if isinstance(solver, Solver):
+                solver = type(solver)()
+
+            problem = PROM(model=self.model, solver=solver, build=True)
+
+            # the model bounds might have changed since this problem was built. The reactions whose bounds differ
+            # are passed as constraints, so that all workers use the bounds of this problem
+            problem_bounds = problem._reaction_bounds()
+            changed = {key: value for key, value in bounds.items() if problem_bounds[key] != value}
+            if changed:
+                problems_kwargs.append({**solver_kwargs,
+                                        'constraints': {**solver_kwargs.get('constraints', {}), **changed}})
+            else:
+                problems_kwargs.append(solver_kwargs)
+
+            problems.append(problem)
+
+        def knockout(problem, problem_kwargs, chunk):
+            return [problem._optimize_ko(probabilities=initial_state,
+                                         regulator=regulator,
+                                         reference=reference,
+                                         max_rates=max_rates,
+                                         bounds=bounds,
+                                         gpr_cache=gpr_cache,
+                                         to_solver=to_solver,
+                                         solver_kwargs=problem_kwargs)
+                    for regulator in chunk]
+
+        if n_jobs == 1:
+            results = [knockout(self, solver_kwargs, regulators)]
+
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(knockout, problems, problems_kwargs,
+                                            [regulators[i::n_jobs] for i in range(n_jobs)]))
+
+        # restoring the order of the regulators
+        ko_solutions = [None] * len(regulators)
+        for i, result in enumerate(results):
+            ko_solutions[i::n_jobs] = result
+
+        return {regulator.id: ko_solution for regulator, ko_solution in zip(regulators, ko_solutions)}
 
     def optimize(self,
                  initial_state: Dict[Tuple[str, str], float] = None,
                  regulators: Union[str, Sequence['str']] = None,
                  to_solver: bool = False,
-                 solver_kwargs: Dict[str, Any] = None) -> Union[KOSolution, Dict[str, Solution]]:
+                 solver_kwargs: Dict[str, Any] = None,
+                 n_jobs: int = 1) -> Union[KOSolution, Dict[str, Solution]]:
         """
         It solves the PROM linear problem. The linear problem is solved using the solver interface.
 
         The optimize method allows setting temporary changes to the linear problem. The changes are
         applied to the linear problem reverted to the original state afterward.
         Objective, constraints and solver parameters can be set temporarily.
+
+        The reaction bounds are the bounds of the linear problem. Changes to the model bounds made after building
+        the problem are only used once the problem is built again, unless the problem is attached to the model.
         :param initial_state: dictionary with the probabilities of
         the interactions between the regulators and the targets.
         :param regulators: list of regulators to be knocked out. If None, all regulators are knocked out.
@@ -288,11 +395,11 @@ class PROM(FBA):
             - reduced_costs: Whether to retrieve the reduced costs. Default: False
             - pool_size: The size of the solution pool. Default: 0
             - pool_gap: The gap between the best solution and the worst solution in the pool. Default: None
+        :param n_jobs: the number of threads sharing the regulators, each with its own linear problem. Default: 1
         :return: A KOSolution instance or a list of SolverSolution instance if to_solver is True.
         """
         # build solver if out of sync
-        if not self.synchronized:
-            self.build()
+        self._synchronize()
 
         if not initial_state:
             initial_state = {}
@@ -312,7 +419,8 @@ class PROM(FBA):
         solutions = self._optimize(initial_state=initial_state,
                                    regulators=regulators,
                                    to_solver=to_solver,
-                                   solver_kwargs=solver_kwargs)
+                                   solver_kwargs=solver_kwargs,
+                                   n_jobs=n_jobs)
 
         if to_solver:
             return solutions
@@ -323,6 +431,38 @@ class PROM(FBA):
 # ----------------------------------------------------------------------------------------------------------------------
 # Probability of Target-Regulator interactions
 # ----------------------------------------------------------------------------------------------------------------------
+def _ks_statistics(values: np.ndarray,
+                   samples_1: np.ndarray,
+                   samples_0: np.ndarray) -> List[Tuple[int, int, int]]:
+    """
+    It computes the two-sample Kolmogorov-Smirnov statistic between two samples of the same values
+    for several pairs of samples at once.
+    The values are sorted once, and the empirical distribution functions of all samples are obtained
+    by cumulative sums over the sorted values.
+    The statistic is kept as an integer (max |count_1 * n_0 - count_0 * n_1|), so that equal statistics
+    can be compared exactly.
+
+    :param values: the values (e.g. the expression of a target gene)
+    :param samples_1: boolean matrix with a row for each pair, marking the values of the first sample
+    :param samples_0: boolean matrix with a row for each pair, marking the values of the second sample
+    :return: a list of tuples (size of the first sample, size of the second sample, integer statistic)
+    """
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+
+    # the distribution functions are evaluated at the last position of each distinct value
+    last = np.append(sorted_values[1:] != sorted_values[:-1], True)
+
+    counts_1 = np.cumsum(samples_1[:, order], axis=1)[:, last]
+    counts_0 = np.cumsum(samples_0[:, order], axis=1)[:, last]
+
+    n_1 = samples_1.sum(axis=1)
+    n_0 = samples_0.sum(axis=1)
+
+    statistics = np.abs(counts_1 * n_0[:, None] - counts_0 * n_1[:, None]).max(axis=1)
+    return list(zip(n_1.tolist(), n_0.tolist(), statistics.tolist()))
+
+
 def target_regulator_interaction_probability(model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
                                              expression: pd.DataFrame,
                                              binary_expression: pd.DataFrame) -> Tuple[Dict[Tuple[str, str], float],
@@ -350,46 +490,91 @@ def target_regulator_interaction_probability(model: Union['Model', 'MetabolicMod
     missed_interactions = {}
     interactions_probabilities = {}
 
+    # the samples of both matrices are paired by label, so that the columns are aligned before
+    # the matrices are indexed by position
+    if not expression.columns.equals(binary_expression.columns):
+        if set(expression.columns) != set(binary_expression.columns) or not expression.columns.is_unique:
+            raise ValueError('The expression and binary expression matrices must have the same samples (columns).')
+
+        binary_expression = binary_expression.reindex(columns=expression.columns)
+
+    # the expression matrices are indexed by row position rather than by label
+    expression_rows = {gene: i for i, gene in enumerate(expression.index)}
+    binary_rows = {gene: i for i, gene in enumerate(binary_expression.index)}
+    expression_values = expression.to_numpy()
+    binary_values = binary_expression.to_numpy()
+
+    # target-regulator pairs to be tested, grouped by target
+    pairs = []
+    targets_idx = []
+    regulators_idx = []
+    pairs_by_target = {}
+
     for interaction in model.yield_interactions():
 
         target = interaction.target
 
-        if not interaction.regulators or target.id not in expression.index:
+        if not interaction.regulators or target.id not in expression_rows:
             missed_interactions[(target.id, target.id)] = 1
             interactions_probabilities[(target.id, target.id)] = 1
             continue
 
-        target_expression = expression.loc[target.id]
-        target_binary = binary_expression.loc[target.id]
-
         for regulator in interaction.yield_regulators():
 
-            if regulator.id not in expression.index:
-                missed_interactions[(target.id, regulator.id)] = 1
-                interactions_probabilities[(target.id, regulator.id)] = 1
+            # the interaction is missed unless the test is significant
+            missed_interactions[(target.id, regulator.id)] = 1
+            interactions_probabilities[(target.id, regulator.id)] = 1
+
+            if regulator.id not in expression_rows:
                 continue
 
-            regulator_binary = binary_expression.loc[regulator.id]
+            pairs_by_target.setdefault(target.id, []).append(len(pairs))
+            pairs.append((target.id, regulator.id))
+            targets_idx.append(binary_rows[target.id])
+            regulators_idx.append(binary_rows[regulator.id])
+
+    if not pairs:
+        return interactions_probabilities, missed_interactions
+
+    regulators_binary = binary_values[regulators_idx]
+
+    # the p-value of the KS test only depends on the statistic and on the size of both samples.
+    # The statistics of all regulators of a target are computed at once, and the scipy test is run once
+    # for each distinct statistic and sample sizes
+    p_values = np.ones(len(pairs))
+    tests = {}
 
-            target_expression_1_regulator = target_expression[regulator_binary == 1]
-            target_expression_0_regulator = target_expression[regulator_binary == 0]
+    for target_id, positions in pairs_by_target.items():
+        target_expression = expression_values[expression_rows[target_id]]
+        samples_1 = regulators_binary[positions] == 1
+        samples_0 = regulators_binary[positions] == 0
 
-            if len(target_expression_1_regulator) == 0 and len(target_expression_0_regulator) == 0:
-                missed_interactions[(target.id, regulator.id)] = 1
-                interactions_probabilities[(target.id, regulator.id)] = 1
+        statistics = _ks_statistics(target_expression, samples_1, samples_0)
+
+        for position, sample_1, sample_0, key in zip(positions, samples_1, samples_0, statistics):
+            n_1, n_0, _ = key
+
+            if n_1 == 0 and n_0 == 0:
                 continue
 
-            _, p_val = ks_2samp(target_expression_1_regulator, target_expression_0_regulator)
-            if p_val < 0.05:
-                target_binary_0_regulator = target_binary[regulator_binary == 0]
+            p_val = tests.get(key)
+            if p_val is None:
+                _, p_val = ks_2samp(target_expression[sample_1], target_expression[sample_0])
+                tests[key] = p_val
 
-                probability = sum(target_binary_0_regulator) / len(target_binary_0_regulator)
+            p_values[position] = p_val
 
-                interactions_probabilities[(target.id, regulator.id)] = probability
-                missed_interactions[(target.id, regulator.id)] = 0
+    significant = np.flatnonzero(p_values < 0.05)
 
-            else:
-                missed_interactions[(target.id, regulator.id)] = 1
-                interactions_probabilities[(target.id, regulator.id)] = 1
+    if len(significant):
+        # P(target = 1 | regulator = 0) of all significant pairs
+        regulators_0 = regulators_binary[significant] == 0
+        targets_binary = binary_values[np.asarray(targets_idx)[significant]]
+        probabilities = (targets_binary * regulators_0).sum(axis=1) / regulators_0.sum(axis=1)
+
+        for position, probability in zip(significant, probabilities):
+            pair = pairs[position]
+            interactions_probabilities[pair] = float(probability)
+            missed_interactions[pair] = 0
 
     return interactions_probabilities, missed_interactions
@@ -35,6 +35,7 @@ def _find_duplicated_state(state, regulatory_solution, regulatory_reactions, reg
 
 
 class RFBA(FBA):
+    __slots__ = ('_regulatory_reactions', '_regulatory_metabolites')
 
     def __init__(self,
                  model: Union[Model, MetabolicModel, RegulatoryModel],
@@ -69,7 +70,7 @@ class RFBA(FBA):
         The regulatory layer is not considered in the linear problem. It is only considered in the simulation step.
         :return:
         """
-        if self.model.is_metabolic():
+        if self._is_model_type('metabolic'):
             self._build_mass_constraints()
 
             self._regulatory_reactions = [rxn.id
@@ -80,7 +81,7 @@ class RFBA(FBA):
                                             for met in self.model.yield_metabolites()
                                             if met.is_regulator()]
 
-            self._linear_objective = {var.id: value for var, value in self.model.objective.items()}
+            self._linear_objective = self._get_model_objective()
             self._minimize = False
 
     def initial_state(self, state: Dict[str, float] = None) -> Dict[str, float]:
@@ -93,7 +94,7 @@ class RFBA(FBA):
         if not state:
             state = {}
 
-        if not self.model.is_regulatory():
+        if not self._is_model_type('regulatory'):
             return state
 
         initial_state = {}
@@ -122,18 +123,21 @@ class RFBA(FBA):
         (reactions and metabolites predicates)
         :return: dict of target keys and a value of the resulting state
         """
-        if not self.model.is_regulatory():
+        if not self._is_model_type('regulatory'):
             return {}
 
         # Solving regulatory model synchronously for the regulators according to the initial state
         # Targets are associated with a single regulatory interaction
         result = {}
         for interaction in self.model.yield_interactions():
+            target = interaction.target
 
             # solving regulators state only
-            if not interaction.target.is_regulator():
+            if not target.is_regulator():
                 continue
 
+            target_id = target.id
+
             # an interaction can have multiple regulatory events, namely one for 0 and another for 1
             for coefficient, event in interaction.regulatory_events.items():
                 if event.is_none:
@@ -141,9 +145,9 @@ class RFBA(FBA):
 
                 eval_result = event.evaluate(values=state)
                 if eval_result:
-                    result[interaction.target.id] = coefficient
+                    result[target_id] = coefficient
                 else:
-                    result[interaction.target.id] = 0.0
+                    result[target_id] = 0.0
         return result
 
     def decode_metabolic_state(self, state: Dict[str, float]) -> Dict[str, float]:
@@ -155,13 +159,14 @@ class RFBA(FBA):
         (reactions and metabolites predicates)
         :return: dict of target keys and a value of the resulting state
         """
-        if not self.model.is_regulatory():
+        if not self._is_model_type('regulatory'):
             return {}
 
         # Solving the whole regulatory model synchronously, as asynchronously would take too much time
         # Targets are associated with a single regulatory interaction
         result = {}
         for interaction in self.model.yield_interactions():
+            target_id = interaction.target.id
 
             # an interaction can have multiple regulatory events, namely one for 0 and another for 1
             for coefficient, event in interaction.regulatory_events.items():
@@ -170,9 +175,9 @@ class RFBA(FBA):
 
                 eval_result = event.evaluate(values=state)
                 if eval_result:
-                    result[interaction.target.id] = coefficient
+                    result[target_id] = coefficient
                 else:
-                    result[interaction.target.id] = 0.0
+                    result[target_id] = 0.0
         return result
 
     def decode_constraints(self, state: Dict[str, float]) -> Dict[str, Tuple[float, float]]:
@@ -185,7 +190,7 @@ class RFBA(FBA):
         """
         # This method retrieves the constraints associated with a given metabolic/regulatory state
 
-        if not self.model.is_metabolic():
+        if not self._is_model_type('metabolic'):
             return {}
 
         constraints = {}
@@ -238,7 +243,7 @@ class RFBA(FBA):
         regulatory_constraints = {**constraints, **regulatory_constraints}
 
         solver_kwargs['constraints'] = regulatory_constraints
-        solver_solution = self.solver.solve(**solver_kwargs)
+        solver_solution = self.solver.solve(**self._solver_kwargs(solver_kwargs))
 
         if solver_solution.values:
             solver_solution.values = {**metabolic_state, **solver_solution.values}
@@ -407,7 +412,7 @@ class RFBA(FBA):
         metabolic_regulatory_constraints = {**constraints, **regulatory_constraints}
 
         solver_kwargs['constraints'] = metabolic_regulatory_constraints
-        solution = self.solver.solve(**solver_kwargs)
+        solution = self.solver.solve(**self._solver_kwargs(solver_kwargs))
 
         if solution.values:
             solution.values = {**initial_state, **regulatory_state, **solution.values}
@@ -508,8 +513,7 @@ class RFBA(FBA):
         :return: A DynamicSolution instance or a list of solver Solutions if to_solver is True.
         """
         # build solver if out of sync
-        if not self.synchronized:
-            self.build()
+        self._synchronize()
 
         if not solver_kwargs:
             solver_kwargs = {}
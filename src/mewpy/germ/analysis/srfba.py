@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
 
 class SRFBA(FBA):
+    __slots__ = ('_model_default_lb', '_model_default_ub')
 
     def __init__(self,
                  model: Union[Model, MetabolicModel, RegulatoryModel],
@@ -897,12 +898,12 @@ class SRFBA(FBA):
 
         :return:
         """
-        if self.model.is_metabolic() and self.model.is_regulatory():
+        if self._is_model_type('metabolic') and self._is_model_type('regulatory'):
             self._build_mass_constraints()
             self._build_gprs()
             self._build_interactions()
 
-            self._linear_objective = {var.id: value for var, value in self.model.objective.items()}
+            self._linear_objective = self._get_model_objective()
             self._minimize = False
 
     def _optimize(self,
@@ -931,14 +932,10 @@ class SRFBA(FBA):
         if not solver_kwargs:
             solver_kwargs = {}
 
-        if 'constraints' in solver_kwargs:
-            constraints = solver_kwargs['constraints'].copy()
+        # the solver arguments are only copied if the initial state must be merged into the constraints
+        if initial_state:
+            constraints = {**solver_kwargs.get('constraints', {}), **initial_state}
+            solver_kwargs = {**solver_kwargs, 'constraints': constraints}
 
-        else:
-            constraints = {}
-
-        constraints = {**constraints, **initial_state}
-        solver_kwargs['constraints'] = constraints
-
-        solution = self.solver.solve(**solver_kwargs)
+        solution = self.solver.solve(**self._solver_kwargs(solver_kwargs))
         return solution
@@ -7,6 +7,8 @@ from .linear_utils import Node
 
 class VariableContainer:
 
+    __slots__ = ('name', 'sub_variables', 'lbs', 'ubs', 'variables_type', '__i', '__n')
+
     def __init__(self,
                  name: str,
                  sub_variables: List[str],
@@ -101,6 +103,8 @@ class VariableContainer:
 
 class ConstraintContainer:
 
+    __slots__ = ('name', 'coefs', 'lbs', 'ubs', '__i', '__n')
+
     def __init__(self,
                  name,
                  coefs,
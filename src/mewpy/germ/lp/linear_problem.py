@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from threading import Lock
 from typing import Union, TYPE_CHECKING, Tuple, Dict, Any
 
 from numpy import zeros
@@ -12,8 +13,44 @@ from .linear_utils import LinkedList, Node, get_solver_instance
 if TYPE_CHECKING:
     from mewpy.germ.models import Model, MetabolicModel, RegulatoryModel
 
+_HTML_TEMPLATE = """
+        <table>
+            <tr>
+                <td>Method</td>
+                <td>{method}</td>
+            </tr>
+            <tr>
+                <td>Model</td>
+                <td>{model}</td>
+            </tr>
+            <tr>
+                <th>Variables</th>
+                <td>{variables}</td>
+            </tr>
+            <tr>
+                <th>Constraints</th>
+                <td>{constraints}</td>
+            </tr>
+            <tr>
+                <th>Objective</th>
+                <td>{objective}</td>
+            </tr>
+            <tr>
+                <th>Solver</th>
+                <td>{solver}</td>
+            </tr>
+            <tr>
+                <th>Synchronized</th>
+                <td>{synchronized}</td>
+            </tr>
+        </table>
+        """
+
 
 class LinearProblem:
+    __slots__ = ('_model', '_initial_solver', '_solver', '_synchronized', '_cols', '_rows', '_sub_cols',
+                 '_constraints', '_variables', '_linear_objective', '_quadratic_objective', '_minimize',
+                 '_repr_html_cache', '_objective_str', '_model_types', '_build_lock', '__weakref__')
 
     def __init__(self,
                  model: Union['Model', 'MetabolicModel', 'RegulatoryModel'],
@@ -84,6 +121,16 @@ class LinearProblem:
         self._quadratic_objective = {}
         self._minimize = True
 
+        # cached html representation and the state it was rendered for
+        self._repr_html_cache = None
+        self._objective_str = None
+
+        # cached model types (e.g. metabolic, regulatory)
+        self._model_types = None
+
+        # guards the lazy build of the linear problem when it is shared between threads
+        self._build_lock = Lock()
+
         if build:
             self.build()
 
@@ -99,48 +146,79 @@ class LinearProblem:
     def __repr__(self):
         return self.__str__()
 
+    def __getstate__(self):
+        """
+        It returns the state of the linear problem for copy and pickle.
+        The build lock cannot be copied, so it is left out and created again in __setstate__
+        :return: a dictionary with the slots of the linear problem
+        """
+        state = {}
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot in ('_build_lock', '__weakref__') or not hasattr(self, slot):
+                    continue
+
+                state[slot] = getattr(self, slot)
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        It restores the state of the linear problem for copy and pickle with a new build lock
+        :param state: a dictionary with the slots of the linear problem
+        :return:
+        """
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+        self._build_lock = Lock()
+
     def _repr_html_(self):
         """
-        It returns a html representation of the linear problem
+        It returns a html representation of the linear problem.
+        The representation is cached until the linear problem is rebuilt or its state changes
         :return:
         """
+        n_variables, n_constraints = self._sizes()
+
+        key = (self._synchronized, id(self._solver), n_variables, n_constraints)
+        if self._repr_html_cache is not None and self._repr_html_cache[0] == key:
+            return self._repr_html_cache[1]
+
         if self.solver:
             solver = self.solver.__class__.__name__
         else:
             solver = 'None'
 
-        return f"""
-        <table>
-            <tr>
-                <td>Method</td>
-                <td>{self.method}</td>
-            </tr>
-            <tr>
-                <td>Model</td>
-                <td>{self.model}</td>
-            </tr>
-            <tr>
-                <th>Variables</th>
-                <td>{len(self.variables)}</td>
-            </tr>
-            <tr>
-                <th>Constraints</th>
-                <td>{len(self.constraints)}</td>
-            </tr>
-            <tr>
-                <th>Objective</th>
-                <td>{self.objective}</td>
-            </tr>
-            <tr>
-                <th>Solver</th>
-                <td>{solver}</td>
-            </tr>
-            <tr>
-                <th>Synchronized</th>
-                <td>{self.synchronized}</td>
-            </tr>
-        </table>
+        html = _HTML_TEMPLATE.format(method=self.method,
+                                     model=self.model,
+                                     variables=n_variables,
+                                     constraints=n_constraints,
+                                     objective=self._get_objective_str(),
+                                     solver=solver,
+                                     synchronized=self.synchronized)
+
+        self._repr_html_cache = (key, html)
+        return html
+
+    def _get_objective_str(self) -> str:
+        """
+        It returns the objective as a string. The string is cached until the objective changes,
+        as it can be long for objectives comprising all reactions (e.g. pFBA)
+        :return: the objective as a string
+        """
+        if self._objective_str is None:
+            self._objective_str = str(self.objective)
+
+        return self._objective_str
+
+    def _sizes(self) -> Tuple[int, int]:
+        """
+        It returns the number of variables and constraints containers of the linear problem
+        without copying the containers' dictionaries
+        :return: a tuple with the number of variables and constraints
         """
+        return len(self._variables), len(self._constraints)
 
     # -----------------------------------------------------------------------------
     # Static attributes
@@ -216,6 +294,27 @@ class LinearProblem:
         """
         return bool(self._minimize)
 
+    def _is_model_type(self, model_type: str) -> bool:
+        """
+        It checks whether the model is of the given type (e.g. metabolic or regulatory).
+        The model types are retrieved once and cached until the linear problem is cleaned
+        :param model_type: the model type
+        :return: True if the model is of the given type, False otherwise
+        """
+        if self._model_types is None:
+            self._model_types = frozenset(self.model.types)
+
+        return model_type in self._model_types
+
+    def _get_model_objective(self) -> Dict[str, Union[float, int]]:
+        """
+        It returns the objective of the model as a dictionary of linear coefficients by variable identifier.
+        The model parses the objective into variables once when the objective is set,
+        so no type checking is required here
+        :return: a dictionary of linear coefficients by variable identifier
+        """
+        return {variable.id: value for variable, value in self.model.objective.items()}
+
     # -----------------------------------------------------------------------------
     # Dynamic attributes
     # -----------------------------------------------------------------------------
@@ -345,6 +444,9 @@ class LinearProblem:
         self._linear_objective = {}
         self._quadratic_objective = {}
         self._minimize = True
+        self._repr_html_cache = None
+        self._objective_str = None
+        self._model_types = None
         return
 
     # -----------------------------------------------------------------------------
@@ -376,6 +478,18 @@ class LinearProblem:
         self._synchronized = True
         return self
 
+    def _synchronize(self):
+        """
+        It builds the linear problem if it is out of sync with the model.
+        The synchronization state is checked again once the build lock is acquired,
+        so that threads sharing this linear problem do not build it concurrently
+        :return:
+        """
+        if not self._synchronized:
+            with self._build_lock:
+                if not self._synchronized:
+                    self.build()
+
     # -----------------------------------------------------------------------------
     # Optimization
     # -----------------------------------------------------------------------------
@@ -421,8 +535,7 @@ class LinearProblem:
         :return: A ModelSolution instance or a SolverSolution instance if to_solver is True.
         """
         # build solver if out of sync
-        if not self.synchronized:
-            self.build()
+        self._synchronize()
 
         if not solver_kwargs:
             solver_kwargs = {}
@@ -437,6 +550,26 @@ class LinearProblem:
         return ModelSolution.from_solver(method=self.method, solution=solution, model=self.model,
                                          minimize=minimize)
 
+    def _solver_kwargs(self, solver_kwargs: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        It returns the keyword arguments to solve this linear problem with the solver interface.
+        The objective and direction of the linear problem are always passed to the solver,
+        unless a temporary objective (linear or quadratic coefficients) is set in the solver keyword arguments.
+        Thus, a temporary objective is not kept by the solver for the following optimizations
+        :param solver_kwargs: solver specific keyword arguments
+        :return: the solver keyword arguments with the objective of the linear problem
+        """
+        if not solver_kwargs:
+            solver_kwargs = {}
+
+        if solver_kwargs.get('linear') is not None or solver_kwargs.get('quadratic') is not None:
+            return solver_kwargs
+
+        return {**solver_kwargs,
+                'linear': self._linear_objective,
+                'quadratic': self._quadratic_objective,
+                'minimize': solver_kwargs.get('minimize', self._minimize)}
+
     # -----------------------------------------------------------------------------
     # Update - Observer interface
     # -----------------------------------------------------------------------------
@@ -491,7 +624,13 @@ class LinearProblem:
         self._linear_objective = linear
         self._quadratic_objective = quadratic
         self._minimize = minimize
-        self.build_solver(objective=True)
+        self._repr_html_cache = None
+        self._objective_str = None
+
+        # a synchronized solver already holds the variables and constraints of the linear problem,
+        # so only the objective is reloaded. Otherwise, the solver is built from scratch
+        rebuild = not self._synchronized
+        self.build_solver(variables=rebuild, constraints=rebuild, objective=True)
 
     # -----------------------------------------------------------------------------
     # Operations/Manipulations - add/remove variables and constraints
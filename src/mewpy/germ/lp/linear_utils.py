@@ -43,6 +43,9 @@ def get_solver_instance(solver: Union[str, Solver] = None) -> Solver:
 
 class Node:
 
+    # a node is created for every variable, sub-variable and constraint of a linear problem
+    __slots__ = ('_next', '_previous', 'value', 'length', 'idxes')
+
     def __init__(self, value, length=None, idxes=None):
 
         if not length:
@@ -446,7 +446,13 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
         else:
             objective = None
 
-        if self.is_metabolic() and self.is_regulatory():
+        # the model types are built from the whole class hierarchy, so they are retrieved only once
+        types = self.types
+        model_types = ', '.join(types)
+        is_metabolic = 'metabolic' in types
+        is_regulatory = 'regulatory' in types
+
+        if is_metabolic and is_regulatory:
             return f"""
             <table>
                 <tr>
@@ -459,7 +465,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                 </tr>
                 <tr>
                     <th>Types</th>
-                    <td>{', '.join(self.types)}</td>
+                    <td>{model_types}</td>
                 </tr>
                 <tr>
                     <th>Compartments</th>
@@ -519,7 +525,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                 </tr>
             </table>
             """
-        elif self.is_metabolic():
+        elif is_metabolic:
             return f"""
             <table>
                 <tr>
@@ -532,7 +538,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                 </tr>
                 <tr>
                     <th>Types</th>
-                    <td>{', '.join(self.types)}</td>
+                    <td>{model_types}</td>
                 </tr>
                 <tr>
                     <th>Compartments</th>
@@ -568,7 +574,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                 </tr>
             </table>
             """
-        elif self.is_regulatory():
+        elif is_regulatory:
             return f"""
             <table>
                 <tr>
@@ -581,7 +587,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                 </tr>
                 <tr>
                     <th>Types</th>
-                    <td>{', '.join(self.types)}</td>
+                    <td>{model_types}</td>
                 </tr>
                 <tr>
                     <th>Compartments</th>
@@ -625,7 +631,7 @@ class Model(Serializer, metaclass=MetaModel, factory=True):
                     </tr>
                     <tr>
                         <th>Types</th>
-                        <td>{', '.join(self.types)}</td>
+                        <td>{model_types}</td>
                     </tr>
                 </table>
                 """
@@ -111,6 +111,9 @@ class ModelSolution:
         self._simulator = simulator
         self.tol = tol
 
+        # solution dictionaries without mid-term variables, which are filtered once on first access
+        self._filtered = {}
+
     # ---------------------------------
     # Buil-in
     # ---------------------------------
@@ -164,16 +167,21 @@ class ModelSolution:
         if model is None:
             return x
 
-        new_x = {}
-
-        for variable, value in x.items():
+        return {variable: value for variable, value in x.items() if model.get(variable, None) is not None}
 
-            model_variable = model.get(variable, None)
-
-            if model_variable is not None:
-                new_x[variable] = value
+    def _get_filtered(self, name: str, x: Dict[str, float]) -> Dict[str, float]:
+        """
+        It returns a copy of the solution dictionary without mid-term variables.
+        The mid-term variables (e.g. the forward and reverse variables of pFBA) are filtered out only once.
+        Internal use only.
+        :param name: The name of the solution dictionary
+        :param x: The solution dictionary
+        :return: A dictionary with the solution without mid-term variables
+        """
+        if name not in self._filtered:
+            self._filtered[name] = self._filter_mid_term_variables(x=x, model=self.model)
 
-        return new_x
+        return self._filtered[name].copy()
 
     @property
     def objective_direction(self) -> str:
@@ -242,7 +250,7 @@ class ModelSolution:
         The variables' values obtained in the solution of the linear problem.
         :return: A dictionary with the variables values
         """
-        return self._filter_mid_term_variables(x=self._x, model=self.model)
+        return self._get_filtered('x', self._x)
 
     @property
     def shadow_prices(self):
@@ -251,7 +259,7 @@ class ModelSolution:
         increase the objective value.
         :return: A dictionary with the shadow prices of the constraints
         """
-        return self._filter_mid_term_variables(x=self._shadow_prices, model=self.model)
+        return self._get_filtered('shadow_prices', self._shadow_prices)
 
     @property
     def reduced_costs(self):
@@ -260,7 +268,7 @@ class ModelSolution:
         to assume a positive value in the optimal solution.
         :return: A dictionary with the reduced costs of the variables
         """
-        return self._filter_mid_term_variables(x=self._reduced_costs, model=self.model)
+        return self._get_filtered('reduced_costs', self._reduced_costs)
 
     def _get_variable_info(self, variable: 'Variable') -> Tuple[Any, str, Optional[float]]:
         """
@@ -686,15 +694,17 @@ class ModelSolution:
     def from_solver(cls,
                     method: str,
                     solution: 'Solution',
+                    minimize: bool = False,
                     **kwargs) -> 'ModelSolution':
         """
         It returns a solution object from a solver solution.
+        The method, model and simulator are set upon construction of the new ModelSolution object.
         :param method: The method used to solve the problem
         :param solution: The solution object returned by the solver
-        :param kwargs: Additional arguments
+        :param minimize: Whether the objective was minimized. Default is False
+        :param kwargs: Additional arguments, such as model and simulator
         :return: A new ModelSolution object
         """
-        minimize = kwargs.pop('minimize', False)
         if minimize:
             objective_direction = 'minimize'
         else:
@@ -22,6 +22,7 @@ Contributors: Paulo Carvalhais
 ##############################################################################
 """
 from math import inf
+import numpy as np
 from copy import deepcopy
 from mewpy.solvers.solution import to_simulation_result
 from mewpy.solvers import solver_instance
@@ -83,24 +84,26 @@ def GIMME(model, expr, biomass=None, condition=0, cutoff=25, growth_frac=0.9,
     constraints[biomass] = (growth_frac * wt_solution.fluxes[biomass], inf)
 
     # make model irreversible
+    # the bounds are read at once and the split variables and constraints are added in a single call each
+    reversible = set()
     if not build_model:
-        for r_id in sim.reactions:
-            lb, _ = sim.get_reaction_bounds(r_id)
-            if lb < 0:
-                pos, neg = r_id + '_p', r_id + '_n'
-                solver.add_variable(pos, 0, inf, update=False)
-                solver.add_variable(neg, 0, inf, update=False)
-        solver.update()
-    
-        for r_id in sim.reactions:
-            lb, _ = sim.get_reaction_bounds(r_id)
-            if lb < 0:
-                pos, neg = r_id + '_p', r_id + '_n'
-                solver.add_constraint(
-                    'c' + pos, {r_id: -1, pos: 1}, '>', 0, update=False)
-                solver.add_constraint(
-                    'c' + neg, {r_id: 1, neg: 1}, '>', 0, update=False)
-        solver.update()
+        rxn_ids = sim.reactions
+        lbs, _ = sim.get_reaction_bounds_array()
+        reversible = [rxn_ids[i] for i in np.flatnonzero(lbs < 0)]
+
+        var_ids, constr_ids, lhs = [], [], []
+        for r_id in reversible:
+            pos, neg = r_id + '_p', r_id + '_n'
+            var_ids.extend([pos, neg])
+            constr_ids.extend(['c' + pos, 'c' + neg])
+            lhs.extend([{r_id: -1, pos: 1}, {r_id: 1, neg: 1}])
+
+        # models without reversible reactions (e.g. irreversible models) do not need the split
+        if reversible:
+            solver.add_variables(var_ids, [0] * len(var_ids), [inf] * len(var_ids))
+            solver.add_constraints(constr_ids, lhs, ['>'] * len(constr_ids), [0] * len(constr_ids))
+
+        reversible = set(reversible)
 
     else:
         convert_to_irreversible(sim, inline=True)
@@ -108,8 +111,7 @@ def GIMME(model, expr, biomass=None, condition=0, cutoff=25, growth_frac=0.9,
     # define the objective
     objective = dict()
     for r_id, val in coeffs.items():
-        lb, _ = sim.get_reaction_bounds(r_id)
-        if not build_model and lb < 0:
+        if r_id in reversible:
             pos, neg = r_id + '_p', r_id + '_n'
             objective[pos] = val
             objective[neg] = val
@@ -126,8 +128,7 @@ def GIMME(model, expr, biomass=None, condition=0, cutoff=25, growth_frac=0.9,
         objective = dict()
 
         for r_id in sim.reactions:
-            lb, _ = sim.get_reaction_bounds(r_id)
-            if lb < 0:
+            if r_id in reversible:
                 pos, neg = r_id + '_p', r_id + '_n'
                 objective[pos] = 1
                 objective[neg] = 1
@@ -152,12 +153,11 @@ def GIMME(model, expr, biomass=None, condition=0, cutoff=25, growth_frac=0.9,
         rx_to_delete = [rx_id for rx_id, v in activity.items() if v==0]   
         sim.remove_reactions(rx_to_delete)
     else:
-        for r_id in sim.reactions:
-            lb, _ = sim.get_reaction_bounds(r_id)
-            if lb < 0:
-                pos, neg = r_id + '_p', r_id + '_n'
-                del solution.values[pos]
-                del solution.values[neg]
+        # the split variables are known by name, so only the reversible reactions are visited
+        for r_id in reversible:
+            pos, neg = r_id + '_p', r_id + '_n'
+            del solution.values[pos]
+            del solution.values[neg]
  
     res = to_simulation_result(model, solution.fobj, constraints, sim, solution)
     if hasattr(solution,'pre_solution'):
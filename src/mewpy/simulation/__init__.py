@@ -66,7 +66,7 @@ def set_default_solver(solvername):
         try:
             import mewpy.solvers as msolvers
             msolvers.set_default_solver(solvername)
-        except:
+        except Exception:
             pass
     else:
         raise RuntimeError(f"Solver {solvername} not available.")
@@ -515,7 +515,20 @@ class Simulation(CobraModelContainer, Simulator):
         #return lb if lb > -np.inf else ModelConstants.REACTION_LOWER_BOUND,\
         #    ub if ub < np.inf else ModelConstants.REACTION_UPPER_BOUND
         return lb,ub
-    
+
+    def get_reaction_bounds_array(self, reactions=None):
+        """
+        Returns the bounds of several reactions as arrays.
+        The bounds of all reactions are read from the model without looking up each reaction.
+
+        :param reactions: list of reaction IDs. Default: all reactions of the model
+        :return: lower bounds and upper bounds, numpy arrays aligned with the reactions
+        """
+        if reactions is not None:
+            return super().get_reaction_bounds_array(reactions)
+        bounds = np.array([rxn.bounds for rxn in self.model.reactions], dtype=float).reshape(-1, 2)
+        return bounds[:, 0], bounds[:, 1]
+
     def set_reaction_bounds(self, reaction_id, lb, ub, track=True):
         """
         Sets the bounds for a given reaction.
@@ -719,20 +732,16 @@ class Simulation(CobraModelContainer, Simulator):
             df = flux_variability_analysis(
                 model, reaction_list=_reactions, loopless=loopless, fraction_of_optimum=obj_frac)
 
-        variability = {}
-        for r_id in _reactions:
-            variability[r_id] = [
-                float(df.loc[r_id][0]), float(df.loc[r_id][1])]
+        # the ranges are taken in a single indexing of the frame rather than row by row
+        values = df.loc[_reactions, ['minimum', 'maximum']].to_numpy(dtype=float)
 
         if format == 'df':
             import pandas as pd
-            e = variability.items()
-            f = [[a, b, c] for a, [b, c] in e]
-            df = pd.DataFrame(f, columns=['Reaction ID', 'Minimum', 'Maximum'])
-            df = df.set_index(df.columns[0])
-            return df
+            return pd.DataFrame(values,
+                                index=pd.Index(_reactions, name='Reaction ID'),
+                                columns=['Minimum', 'Maximum'])
         else:
-            return variability
+            return dict(zip(_reactions, values.tolist()))
 
     def set_objective(self, reaction_id:str):
         self.model.objective = reaction_id
@@ -38,6 +38,9 @@ class GERMModel(ModelContainer):
 
         self.model = model
 
+        # string representation of the reactions' gprs and the gpr object it was computed for
+        self._gpr_strings = {}
+
     # -----------------------------------------------------------------------------
     # Metabolic static attributes
     # -----------------------------------------------------------------------------
@@ -112,15 +115,13 @@ class GERMModel(ModelContainer):
         if self.model.is_metabolic():
             reaction = self.model.get(r_id)
             if reaction:
-                reaction = {
-                    'id': reaction.id,
-                    'name': reaction.name,
-                    'lower_bound': reaction.lower_bound,
-                    'upper_bound': reaction.upper_bound,
-                    'stoichiometry': {met.id: c for met, c in reaction.stoichiometry.items()},
-                    'gpr': reaction.gene_protein_reaction_rule,
-                }
-                AttrDict(reaction)
+                lb, ub = reaction.bounds
+                return AttrDict(id=reaction.id,
+                                name=reaction.name,
+                                lower_bound=lb,
+                                upper_bound=ub,
+                                stoichiometry={met.id: c for met, c in reaction.stoichiometry.items()},
+                                gpr=self._gpr_to_string(reaction))
         return AttrDict()
 
     def get_gene(self, g_id: str) -> AttrDict:
@@ -184,10 +185,26 @@ class GERMModel(ModelContainer):
             if reaction:
 
                 if not reaction.gpr.is_none:
-                    return reaction.gpr.to_string()
+                    return self._gpr_to_string(reaction)
 
         return
 
+    def _gpr_to_string(self, reaction: Reaction) -> str:
+        """
+        It returns the string representation of the gpr of a reaction.
+        The string is cached per reaction until the gpr of the reaction is replaced
+        :param reaction: the reaction
+        :return: a string representation of the gpr
+        """
+        gpr = reaction.gpr
+
+        cached = self._gpr_strings.get(reaction.id)
+        if cached is None or cached[0] is not gpr:
+            cached = (gpr, gpr.to_string())
+            self._gpr_strings[reaction.id] = cached
+
+        return cached[1]
+
     # -----------------------------------------------------------------------------
     # Metabolic static attributes setters
     # -----------------------------------------------------------------------------
@@ -481,6 +481,19 @@ class Simulation(CBModelContainer, Simulator):
         #    ub if ub < np.inf else ModelConstants.REACTION_UPPER_BOUND
         return lb,ub
 
+    def get_reaction_bounds_array(self, reactions=None):
+        """
+        Returns the bounds of several reactions as arrays.
+        The bounds of all reactions are read from the model without looking up each reaction.
+
+        :param reactions: list of reaction IDs. Default: all reactions of the model
+        :return: lower bounds and upper bounds, numpy arrays aligned with the reactions
+        """
+        if reactions is not None:
+            return super().get_reaction_bounds_array(reactions)
+        bounds = np.array([(rxn.lb, rxn.ub) for rxn in self.model.reactions.values()], dtype=float).reshape(-1, 2)
+        return bounds[:, 0], bounds[:, 1]
+
     def set_reaction_bounds(self, reaction, lb, ub, track=True):
         """
         Sets the bounds for a given reaction.
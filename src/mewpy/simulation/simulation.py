@@ -28,6 +28,7 @@ from joblib import Parallel, delayed
 from tqdm import tqdm
 from copy import deepcopy
 import math
+import numpy as np
 
 from ..util.parsing import evaluate_expression_tree
 from ..util.process import cpu_count
@@ -257,6 +258,18 @@ class Simulator(ModelContainer, SimulationInterface):
     def get_reaction_bounds(self, r_id):
         raise NotImplementedError
 
+    def get_reaction_bounds_array(self, reactions=None):
+        """
+        Returns the bounds of several reactions as arrays.
+
+        :param reactions: list of reaction IDs. Default: all reactions of the model
+        :return: lower bounds and upper bounds, numpy arrays aligned with the reactions
+        """
+        if reactions is None:
+            reactions = self.reactions
+        bounds = np.array([self.get_reaction_bounds(r_id) for r_id in reactions], dtype=float).reshape(-1, 2)
+        return bounds[:, 0], bounds[:, 1]
+
     def set_environmental_conditions(self, medium):
         for k, v in medium.items():
             if isinstance(v, tuple):
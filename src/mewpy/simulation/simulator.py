@@ -36,6 +36,45 @@ map_model_simulator = {
     'mewpy.germ.models.model.RegulatoryMetabolicModel': ('mewpy.simulation.germ', 'Simulation'),
 }
 
+# Simulator classes resolved by model class. Entries take the form:  model_class -> (kind, simulator_class)
+_simulator_classes = {}
+
+
+def _find_simulator_class(model_class):
+    """
+    Finds the simulator class of a model class.
+
+    :param model_class: the class of the model
+    :returns: A tuple (kind, simulator class), where kind is one of 'mapped', 'etfl', 'cobra' or 'reframed'.
+        The simulator class is None if the model class has no defined simulator.
+    """
+    name = f"{model_class.__module__}.{model_class.__name__}"
+    if name in map_model_simulator:
+        module_name, class_name = map_model_simulator[name]
+        module = __import__(module_name, fromlist=[None])
+        return 'mapped', getattr(module, class_name)
+
+    if "etfl" in name:
+        return 'etfl', None
+
+    try:
+        from cobra.core.model import Model
+        if issubclass(model_class, Model):
+            from .cobra import Simulation
+            return 'cobra', Simulation
+    except ImportError:
+        pass
+
+    try:
+        from reframed.core.cbmodel import CBModel
+        if issubclass(model_class, CBModel):
+            from .reframed import Simulation
+            return 'reframed', Simulation
+    except ImportError:
+        pass
+
+    return None, None
+
 
 def get_simulator(model, envcond=None, constraints=None, reference=None, reset_solver=ModelConstants.RESET_SOLVER):
     """
@@ -56,15 +95,17 @@ def get_simulator(model, envcond=None, constraints=None, reference=None, reset_s
     if isinstance(model, Simulator):
         return model.copy()
 
+    model_class = model.__class__
+    if model_class not in _simulator_classes:
+        _simulator_classes[model_class] = _find_simulator_class(model_class)
+    kind, class_ = _simulator_classes[model_class]
+
     instance = None
-    name = f"{model.__class__.__module__}.{model.__class__.__name__}"
-    if name in map_model_simulator:
-        module_name, class_name = map_model_simulator[name]
-        module = __import__(module_name, fromlist=[None])
-        class_ = getattr(module, class_name)
+    name = f"{model_class.__module__}.{model_class.__name__}"
+    if kind == 'mapped':
         try:
             model.solver.configuration.timeout = ModelConstants.SOLVER_TIMEOUT
-        except:
+        except Exception:
             pass
         try:
             model.solver.problem.params.OutputFlag = 0
@@ -72,7 +113,7 @@ def get_simulator(model, envcond=None, constraints=None, reference=None, reset_s
             pass
         instance = class_(model, envcond=envcond,
                           constraints=constraints, reference=reference, reset_solver=reset_solver)
-    elif "etfl" in name:
+    elif kind == 'etfl':
         try:
             from .cobra import Simulation
             from etfl.optim.config import standard_solver_config
@@ -84,25 +125,13 @@ def get_simulator(model, envcond=None, constraints=None, reference=None, reset_s
             instance._MIN_STR = 'min'
         except Exception:
             raise RuntimeError("Could not create simulator for the ETFL model")
-    else:
-        try:
-            from cobra.core.model import Model
-            if isinstance(model, Model):
-                from .cobra import Simulation
-                model.solver.configuration.timeout = ModelConstants.SOLVER_TIMEOUT
-                instance = Simulation(
-                    model, envcond=envcond, constraints=constraints, reference=reference, reset_solver=reset_solver)
-        except ImportError:
-            pass
-        if not instance:
-            try:
-                from reframed.core.cbmodel import CBModel
-                if isinstance(model, CBModel):
-                    from .reframed import Simulation
-                    instance = Simulation(
-                        model, envcond=envcond, constraints=constraints, reference=reference, reset_solver=reset_solver)
-            except ImportError:
-                pass
+    elif kind == 'cobra':
+        model.solver.configuration.timeout = ModelConstants.SOLVER_TIMEOUT
+        instance = class_(model, envcond=envcond, constraints=constraints, reference=reference,
+                          reset_solver=reset_solver)
+    elif kind == 'reframed':
+        instance = class_(model, envcond=envcond, constraints=constraints, reference=reference,
+                          reset_solver=reset_solver)
 
     if not instance:
         raise ValueError(f"The model <{name}> has no defined simulator.")
@@ -72,7 +72,8 @@ class CplexSolver(Solver):
             Parameter.MIP_ABS_GAP: self.problem.parameters.mip.tolerances.mipgap,
             Parameter.MIP_REL_GAP: self.problem.parameters.mip.tolerances.absmipgap,
             Parameter.POOL_SIZE: self.problem.parameters.mip.limits.populate,
-            Parameter.POOL_GAP: self.problem.parameters.mip.pool.relgap
+            Parameter.POOL_GAP: self.problem.parameters.mip.pool.relgap,
+            Parameter.WARM_START: self.problem.parameters.advance
         }
 
         self.set_parameters(default_parameters)
@@ -104,7 +105,7 @@ class CplexSolver(Solver):
         else:
             self._cached_vars.append((var_id, lb, ub, vartype))
 
-    def add_variables(self, var_ids, lbs, ubs, vartypes):
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None):
         """ Add multiple variables to the current problem.
 
         Arguments:
@@ -114,6 +115,9 @@ class CplexSolver(Solver):
             vartypes (list): variable types (default: CONTINUOUS)
         """
 
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
         lbs = list(map(infinity_fix, lbs))
         ubs = list(map(infinity_fix, ubs))
 
@@ -157,7 +161,7 @@ class CplexSolver(Solver):
         else:
             self._cached_constrs.append((constr_id, lhs, sense, rhs))
 
-    def add_constraints(self, constr_ids, lhs, senses, rhs):
+    def add_constraints(self, constr_ids, lhs, senses=None, rhs=None):
         """ Add a list of constraints to the current problem.
 
         Arguments:
@@ -167,6 +171,11 @@ class CplexSolver(Solver):
             rhs (list): right-hand side of equations (default: 0)
         """
 
+        if senses is None:
+            senses = ['='] * len(constr_ids)
+        if rhs is None:
+            rhs = [0] * len(constr_ids)
+
         map_sense = {'=': 'E',
                      '<': 'L',
                      '>': 'G'}
@@ -23,7 +23,7 @@ https://github.com/cdanielmachado/reframed
 """
 from .solver import Solver, VarType, Parameter, default_parameters
 from .solution import Solution, Status
-from gurobipy import Model as GurobiModel, GRB, quicksum
+from gurobipy import Model as GurobiModel, GRB, LinExpr, quicksum
 from math import inf
 from warnings import warn
 
@@ -58,7 +58,8 @@ parameter_mapping = {
     Parameter.MIP_ABS_GAP: GRB.Param.MIPGapAbs,
     Parameter.MIP_REL_GAP: GRB.Param.MIPGap,
     Parameter.POOL_SIZE: GRB.Param.PoolSolutions,
-    Parameter.POOL_GAP: GRB.Param.PoolGap
+    Parameter.POOL_GAP: GRB.Param.PoolGap,
+    Parameter.WARM_START: GRB.Param.LPWarmStart
 }
 
 
@@ -99,6 +100,39 @@ class GurobiSolver(Solver):
         if update:
             self.problem.update()
 
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None):
+        """ Add multiple variables to the current problem in a single call.
+
+        Arguments:
+            var_ids (list): variable identifiers
+            lbs (list): lower bounds
+            ubs (list): upper bounds
+            vartypes (list): variable types (default: CONTINUOUS)
+        """
+
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
+        # a variable repeated in the batch keeps the last bounds and type, as when added one by one
+        batch = {var_id: (lb, ub, vartype) for var_id, lb, ub, vartype in zip(var_ids, lbs, ubs, vartypes)}
+
+        existing = set(self.var_ids)
+        new_ids, new_lbs, new_ubs, new_types = [], [], [], []
+        for var_id, (lb, ub, vartype) in batch.items():
+            if var_id in existing:
+                self.add_variable(var_id, lb, ub, vartype, update=False)
+            else:
+                new_ids.append(var_id)
+                new_lbs.append(infinity_fix(lb))
+                new_ubs.append(infinity_fix(ub))
+                new_types.append(vartype_mapping[vartype])
+
+        if new_ids:
+            self.problem.addVars(len(new_ids), lb=new_lbs, ub=new_ubs, vtype=new_types, name=new_ids)
+            self.var_ids.extend(new_ids)
+
+        self.problem.update()
+
     def set_variable_bounds(self, var_id, lb, ub):
         """Modify a variable bounds
 
@@ -141,6 +175,48 @@ class GurobiSolver(Solver):
         if update:
             self.problem.update()
 
+    def add_constraints(self, constr_ids, lhs, senses=None, rhs=None):
+        """ Add multiple constraints to the current problem in a single update.
+
+        Arguments:
+            constr_ids (list): constraint identifiers
+            lhs (list): variables and respective coefficients
+            senses (list): constraint senses (default: '=')
+            rhs (list): right-hand side of equations (default: 0)
+        """
+
+        if senses is None:
+            senses = ['='] * len(constr_ids)
+        if rhs is None:
+            rhs = [0] * len(constr_ids)
+
+        grb_sense = {'=': GRB.EQUAL,
+                     '<': GRB.LESS_EQUAL,
+                     '>': GRB.GREATER_EQUAL}
+
+        # a constraint repeated in the batch replaces the previous one, as when added one by one
+        batch = {}
+        for constr_id, constr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            batch.pop(constr_id, None)
+            batch[constr_id] = (constr, sense, value)
+
+        self.problem.update()
+
+        existing = set(self.constr_ids).intersection(batch)
+        if existing:
+            self.remove_constraints(existing)
+
+        # resolve variables through a single name map instead of a lookup per coefficient
+        variables = {var.VarName: var for var in self.problem.getVars()}
+
+        for constr_id, (constr, sense, value) in batch.items():
+            coeffs = [coeff for coeff in constr.values() if coeff]
+            lpvars = [variables[r_id] for r_id, coeff in constr.items() if coeff]
+            self.problem.addLConstr(LinExpr(coeffs, lpvars), grb_sense[sense], value, constr_id)
+
+        self.constr_ids.extend(batch)
+        self.problem.update()
+
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
 
@@ -82,6 +82,36 @@ class OptLangSolver(Solver):
         if update:
             self.problem.update()
 
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None):
+        """ Add multiple variables to the current problem in a single call.
+
+        Arguments:
+            var_ids (list): variable identifiers
+            lbs (list): lower bounds
+            ubs (list): upper bounds
+            vartypes (list): variable types (default: CONTINUOUS)
+        """
+
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
+        # a variable repeated in the batch keeps the last bounds and type, as when added one by one
+        batch = {var_id: (lb, ub, vartype) for var_id, lb, ub, vartype in zip(var_ids, lbs, ubs, vartypes)}
+
+        existing = set(self.var_ids)
+        new_vars = []
+        for var_id, (lb, ub, vartype) in batch.items():
+            if var_id in existing:
+                self.add_variable(var_id, lb, ub, vartype, update=False)
+            else:
+                new_vars.append(Variable(var_id, lb=lb, ub=ub, type=vartype.value))
+                self.var_ids.append(var_id)
+
+        if new_vars:
+            self.problem.add(new_vars)
+
+        self.problem.update()
+
     def set_variable_bounds(self, var_id, lb, ub):
         """Modify a variable bounds
 
@@ -128,6 +158,51 @@ class OptLangSolver(Solver):
         if update:
             self.problem.update()
 
+    def add_constraints(self, constr_ids, lhs, senses=None, rhs=None):
+        """ Add multiple constraints to the current problem in a single call.
+
+        Arguments:
+            constr_ids (list): constraint identifiers
+            lhs (list): variables and respective coefficients
+            senses (list): constraint senses (default: '=')
+            rhs (list): right-hand side of equations (default: 0)
+        """
+
+        if senses is None:
+            senses = ['='] * len(constr_ids)
+        if rhs is None:
+            rhs = [0] * len(constr_ids)
+
+        # a constraint repeated in the batch replaces the previous one, as when added one by one
+        batch = {}
+        for constr_id, expr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            batch.pop(constr_id, None)
+            batch[constr_id] = (expr, sense, value)
+
+        existing = set(self.constr_ids)
+        constrs = []
+        for constr_id, (_, sense, value) in batch.items():
+            if constr_id in existing:
+                self.problem.remove(constr_id)
+                self.constr_ids.remove(constr_id)
+            if sense == '=':
+                constrs.append(Constraint(Zero, lb=value, ub=value, name=constr_id))
+            elif sense == '>':
+                constrs.append(Constraint(Zero, lb=value, name=constr_id))
+            elif sense == '<':
+                constrs.append(Constraint(Zero, ub=value, name=constr_id))
+            else:
+                raise RuntimeError(f"Invalid constraint direction: {sense}")
+
+        self.problem.add(constrs)
+        self.constr_ids.extend(batch)
+
+        variables = self.problem.variables
+        for constr, (expr, _, _) in zip(constrs, batch.values()):
+            constr.set_linear_coefficients({variables[r_id]: coeff for r_id, coeff in expr.items() if coeff})
+
+        self.problem.update()
+
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
 
@@ -255,7 +330,7 @@ class OptLangSolver(Solver):
                 if r_id in self.var_ids:
                     lpvar = problem.variables[r_id]
                     old_constraints[r_id] = (lpvar.lb, lpvar.ub)
-                    lpvar.lb, lpvar.ub = lb, ub
+                    lpvar.set_bounds(lb, ub)
                 else:
                     warn(f"Constrained variable '{r_id}' not previously declared")
             problem.update()
@@ -297,7 +372,7 @@ class OptLangSolver(Solver):
         if constraints:
             for r_id, (lb, ub) in old_constraints.items():
                 lpvar = problem.variables[r_id]
-                lpvar.lb, lpvar.ub = lb, ub
+                lpvar.set_bounds(lb, ub)
             problem.update()
 
         return solution
@@ -46,6 +46,7 @@ class Parameter(Enum):
     MIP_ABS_GAP = 5
     POOL_SIZE = 6
     POOL_GAP = 7
+    WARM_START = 8
 
 
 default_parameters = {
@@ -77,6 +78,22 @@ class Solver(object):
             update (bool): update problem immediately (default: True)
         """
 
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None):
+        """ Add multiple variables to the current problem in a single update.
+
+        Arguments:
+            var_ids (list): variable identifiers
+            lbs (list): lower bounds
+            ubs (list): upper bounds
+            vartypes (list): variable types (default: CONTINUOUS)
+        """
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
+        for var_id, lb, ub, vartype in zip(var_ids, lbs, ubs, vartypes):
+            self.add_variable(var_id, lb, ub, vartype, update=False)
+        self.update()
+
     def set_variable_bounds(self, var_id, lb, ub):
         """Modify a variable bounds
 
@@ -99,6 +116,24 @@ class Solver(object):
         """
         pass
 
+    def add_constraints(self, constr_ids, lhs, senses=None, rhs=None):
+        """ Add multiple constraints to the current problem in a single update.
+
+        Arguments:
+            constr_ids (list): constraint identifiers
+            lhs (list): variables and respective coefficients
+            senses (list): constraint senses (default: '=')
+            rhs (list): right-hand side of equations (default: 0)
+        """
+        if senses is None:
+            senses = ['='] * len(constr_ids)
+        if rhs is None:
+            rhs = [0] * len(constr_ids)
+
+        for constr_id, expr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            self.add_constraint(constr_id, expr, sense, value, update=False)
+        self.update()
+
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
 
@@ -194,15 +229,13 @@ class Solver(object):
         Args:
             simulator: A phenotype simulator
         """
-        for r_id in simulator.reactions:
-            lb, ub = simulator.get_reaction_bounds(r_id)
-            self.add_variable(r_id, lb, ub, update=False)
-        self.update()
+        var_ids = list(simulator.reactions)
+        lbs, ubs = simulator.get_reaction_bounds_array()
+        self.add_variables(var_ids, lbs.tolist(), ubs.tolist())
 
+        constr_ids = list(simulator.metabolites)
         table = simulator.metabolite_reaction_lookup()
-        for m_id in simulator.metabolites:
-            self.add_constraint(m_id, table[m_id], update=False)
-        self.update()
+        self.add_constraints(constr_ids, [table[m_id] for m_id in constr_ids])
 
     def solve(self, linear=None, quadratic=None, minimize=None, model=None, constraints=None, get_values=True,
               shadow_prices=False, reduced_costs=False, pool_size=0, pool_gap=None):
@@ -228,6 +261,41 @@ class Solver(object):
         # An exception is raised if the subclass does not implement this method.
         raise Exception('Not implemented for this solver.')
 
+    def solve_batch(self, constraints, base_constraints=None, **kwargs):
+        """ Solve the optimization problem for several sets of additional constraints.
+        The problems are solved one after the other by default. Solvers supporting batch optimization
+        may override this method to solve all problems at once.
+
+        Arguments:
+            constraints (list): additional constraints (dict) of each problem
+            base_constraints (dict): constraints shared by all problems, which are overridden by the
+                constraints of each problem (optional)
+            kwargs: additional arguments passed to **solve** for all problems
+
+        Returns:
+            list: a Solution for each set of constraints
+        """
+        if not base_constraints:
+            base_constraints = {}
+
+        # a single dictionary is updated with the constraints of each problem and restored afterwards,
+        # so that the base constraints are not copied for every problem
+        merged = dict(base_constraints)
+
+        solutions = []
+        for problem_constraints in constraints:
+            merged.update(problem_constraints)
+
+            solutions.append(self.solve(constraints=merged, **kwargs))
+
+            for key in problem_constraints:
+                if key in base_constraints:
+                    merged[key] = base_constraints[key]
+                else:
+                    del merged[key]
+
+        return solutions
+
     def get_solution_pool(self, get_values=True):
         """ Return a solution pool for MILP problems.
         Must be called after using solve with pool_size argument > 0.
@@ -88,6 +88,25 @@ class TestReframedSimul(unittest.TestCase):
         solver = solver_instance(self.simul)
         solver.solve()
 
+    def test_reaction_bounds_array(self):
+        """Tests the bounds arrays against the bounds of each reaction
+        """
+        if hasattr(self.simul, 'set_reaction_bounds'):
+            self.simul.set_reaction_bounds(self.SUCC, -3, 7)
+        else:
+            # the GERM simulator keeps additional constraints apart from the model bounds
+            self.simul.constraints[self.SUCC] = (-3, 7)
+        self.assertEqual(tuple(self.simul.get_reaction_bounds(self.SUCC)), (-3, 7))
+        reactions = list(self.simul.reactions)
+
+        for subset in (None, reactions[::-3], [self.SUCC], []):
+            lbs, ubs = self.simul.get_reaction_bounds_array(subset)
+            subset = reactions if subset is None else subset
+            self.assertEqual(len(lbs), len(subset))
+            self.assertEqual(len(ubs), len(subset))
+            for r_id, lb, ub in zip(subset, lbs, ubs):
+                self.assertEqual((lb, ub), tuple(self.simul.get_reaction_bounds(r_id)))
+
 
 class TestCobra(TestReframedSimul):
     """Tests COBRApy Simulator
@@ -217,5 +236,108 @@ class TestGeckoSimul(unittest.TestCase):
         pass
 
 
+class TestSolver(unittest.TestCase):
+    """Tests the solver interface
+    """
+
+    def setUp(self):
+        """Set up
+        Loads a model
+        """
+        from cobra.io.sbml import read_sbml_model
+        model = read_sbml_model(EC_CORE_MODEL)
+        from mewpy.simulation import get_simulator
+        self.simul = get_simulator(model)
+
+    def test_solve_batch(self):
+        """Tests that a batch of problems is solved as one problem at a time
+        """
+        from mewpy.solvers import solver_instance
+        solver = solver_instance(self.simul)
+
+        base_constraints = {'EX_glc__D_e': (-10, 1000), 'PGI': (-5, 5)}
+        constraints = [{},
+                       {'PGI': (0, 0)},
+                       # infeasible
+                       {'ATPM': (1000, 1000)},
+                       {'EX_glc__D_e': (-5, 1000), 'EX_o2_e': (0, 1000)}]
+
+        solutions = solver.solve_batch(constraints, base_constraints=base_constraints,
+                                       linear={'BIOMASS_Ecoli_core_w_GAM': 1}, minimize=False, get_values=False)
+        self.assertEqual(len(solutions), len(constraints))
+        self.assertEqual(base_constraints, {'EX_glc__D_e': (-10, 1000), 'PGI': (-5, 5)})
+
+        for problem_constraints, solution in zip(constraints, solutions):
+            expected = solver.solve(linear={'BIOMASS_Ecoli_core_w_GAM': 1}, minimize=False, get_values=False,
+                                    constraints={**base_constraints, **problem_constraints})
+            self.assertEqual(solution.status, expected.status)
+
+            if expected.fobj is not None:
+                self.assertAlmostEqual(solution.fobj, expected.fobj, places=6)
+
+        from mewpy.solvers.solution import Status
+        self.assertNotEqual(solutions[2].status, Status.OPTIMAL)
+        self.assertEqual(solutions[0].status, Status.OPTIMAL)
+        self.assertGreater(solutions[0].fobj, MIN_GROWTH)
+
+    def test_add_batch(self):
+        """Tests that adding variables and constraints in batches builds the same problem as one at a time
+        """
+        from mewpy.solvers import solver_instance
+        from mewpy.solvers.optlang_solver import OptLangSolver
+
+        reactions = list(self.simul.reactions)
+        bounds = [self.simul.get_reaction_bounds(r_id) for r_id in reactions]
+        table = self.simul.metabolite_reaction_lookup()
+        metabolites = list(self.simul.metabolites)
+
+        # repeated identifiers, within the batch and already in the problem, are replaced by the last entry
+        var_ids = reactions + ['x', 'x', 'PGI']
+        lbs = [lb for lb, _ in bounds] + [0, 0, -5]
+        ubs = [ub for _, ub in bounds] + [1, 5, 5]
+        constr_ids = metabolites + ['c', 'c', metabolites[0]]
+        lhs = [table[m_id] for m_id in metabolites] + [{'x': 1, 'PGI': -1}, {'x': 1, 'PGI': 1}, {'x': 1}]
+        senses = ['='] * len(metabolites) + ['<', '>', '<']
+        rhs = [0] * len(metabolites) + [1, 2, 3]
+
+        batch = solver_instance()
+        if not isinstance(batch, OptLangSolver):
+            self.skipTest('The problem structure is only compared for optlang')
+
+        batch.add_variables(reactions, lbs[:len(reactions)], ubs[:len(reactions)])
+        batch.add_constraints(metabolites, lhs[:len(metabolites)], senses[:len(metabolites)],
+                              rhs[:len(metabolites)])
+        batch.add_variables(var_ids[len(reactions):], lbs[len(reactions):], ubs[len(reactions):])
+        batch.add_constraints(constr_ids[len(metabolites):], lhs[len(metabolites):], senses[len(metabolites):],
+                              rhs[len(metabolites):])
+
+        single = solver_instance()
+        for var_id, lb, ub in zip(var_ids, lbs, ubs):
+            single.add_variable(var_id, lb, ub, update=False)
+        for constr_id, expr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            single.add_constraint(constr_id, expr, sense, value, update=False)
+        single.update()
+
+        def structure(solver):
+            problem = solver.problem
+            variables = {var.name: (var.lb, var.ub, var.type) for var in problem.variables}
+            constraints = {}
+            for constr in problem.constraints:
+                coefficients = {var.name: coeff for var, coeff in constr.get_linear_coefficients(
+                    constr.variables).items() if coeff}
+                constraints[constr.name] = (constr.lb, constr.ub, coefficients)
+            return variables, constraints
+
+        self.assertEqual(batch.var_ids, single.var_ids)
+        self.assertEqual(set(batch.constr_ids), set(single.constr_ids))
+        self.assertEqual(len(batch.constr_ids), len(set(batch.constr_ids)))
+        self.assertEqual(structure(batch), structure(single))
+        self.assertEqual(structure(batch)[1]['c'], (2, None, {'x': 1, 'PGI': 1}))
+
+        objective = {'BIOMASS_Ecoli_core_w_GAM': 1}
+        self.assertAlmostEqual(batch.solve(objective, minimize=False).fobj,
+                               single.solve(objective, minimize=False).fobj, places=6)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -974,5 +974,484 @@ class TestGERMModel(unittest.TestCase):
         self.assertIsNot(deep_copy_model.get('r6'), dict_model.get('r6'))
 
 
+class TestGERMAnalysis(unittest.TestCase):
+    """ Tests the GERM analysis methods
+    """
+
+    def setUp(self):
+        """Set up
+        Loads a model
+        """
+
+        from mewpy.io import Reader, Engines, read_model
+
+        self.model = read_model(Reader(Engines.MetabolicSBML, EC_CORE_MODEL))
+        self.model.objective = {'Biomass_Ecoli_core': 1}
+
+    def test_linear_problem_copy(self):
+        """
+        Tests the deep copy of linear problems before and after building
+        """
+        import copy
+        from mewpy.germ.analysis import FBA, pFBA
+
+        for method in (FBA, pFBA):
+            problem = method(self.model)
+            problem_copy = copy.deepcopy(problem)
+            self.assertIsNot(problem_copy._build_lock, problem._build_lock)
+
+            problem.build()
+            problem_copy = copy.deepcopy(problem)
+            self.assertIsNot(problem_copy._build_lock, problem._build_lock)
+            self.assertAlmostEqual(problem_copy.optimize().objective_value,
+                                   problem.optimize().objective_value,
+                                   places=6)
+
+    def test_optlang_objective(self):
+        """
+        Tests that the objective of the linear problem is solved with the optlang solver,
+        and that a temporary objective does not affect the following optimizations
+        """
+        from mewpy.io import Reader, Engines, read_model
+        from mewpy.germ.analysis import FBA, pFBA, PROM
+
+        fba = FBA(self.model, solver='optlang').build()
+        fba_sol = fba.optimize()
+        self.assertAlmostEqual(fba_sol.objective_value, 0.8739, places=3)
+        self.assertAlmostEqual(fba_sol.objective_value, fba_sol.x['Biomass_Ecoli_core'], places=6)
+
+        glc_sol = fba.optimize(solver_kwargs={'linear': {'EX_glc__D_e': 1}})
+        self.assertAlmostEqual(glc_sol.objective_value, glc_sol.x['EX_glc__D_e'], places=6)
+
+        fba_sol = fba.optimize()
+        self.assertAlmostEqual(fba_sol.objective_value, 0.8739, places=3)
+        self.assertAlmostEqual(fba_sol.objective_value, fba_sol.x['Biomass_Ecoli_core'], places=6)
+
+        pfba = pFBA(self.model, solver='optlang').build()
+        pfba_sol = pfba.optimize()
+        self.assertAlmostEqual(pfba_sol.objective_value, 518.422, places=2)
+        self.assertAlmostEqual(pfba_sol.x['Biomass_Ecoli_core'], 0.8739, places=3)
+
+        pfba.optimize(solver_kwargs={'linear': {'EX_glc__D_e': 1}})
+        self.assertAlmostEqual(pfba.optimize().objective_value, 518.422, places=2)
+
+        # the wild-type and knockout solutions of PROM are not solved with the objectives of the fva
+        regulatory_reader = Reader(Engines.BooleanRegulatoryCSV, EC_CORE_REG_MODEL, sep=',', id_col=0, rule_col=2,
+                                   aliases_cols=[1], header=0)
+        model = read_model(regulatory_reader, Reader(Engines.MetabolicSBML, EC_CORE_MODEL))
+        model.objective = {'Biomass_Ecoli_core': 1}
+
+        regulators = list(model.regulators)[:5]
+        prom_sol = PROM(model, solver='optlang').build().optimize(regulators=regulators)
+        self.assertEqual(len(prom_sol.solutions), len(regulators))
+        for solution in prom_sol.solutions.values():
+            self.assertAlmostEqual(solution.objective_value, solution.x['Biomass_Ecoli_core'], places=6)
+            self.assertGreater(solution.objective_value, 0)
+
+        model = read_model(Reader(Engines.BooleanRegulatoryCSV, SAMPLE_REG_MODEL, sep=',', id_col=0, rule_col=1),
+                           Reader(Engines.MetabolicSBML, SAMPLE_MODEL))
+        model.objective = {'r11': 1}
+
+        probabilities = {('g29', 'g10'): 0.1, ('g30', 'g10'): 0.9, ('g35', 'g34'): 0.1}
+        prom_sol = PROM(model, solver='optlang').build().optimize(initial_state=probabilities,
+                                                                  regulators=['g29', 'g30', 'g35'])
+        for solution in prom_sol.solutions.values():
+            self.assertAlmostEqual(solution.objective_value, 333.333, places=2)
+
+    def test_pfba_wild_type(self):
+        """
+        Tests that the wild-type objective value of pFBA is only cached without solver arguments changing it
+        """
+        from mewpy.germ.analysis import pFBA
+
+        pfba = pFBA(self.model).build()
+        self.assertEqual(pfba._wt_bounds(solver_kwargs={'minimize': True, 'get_values': False}), (0.0, 0.0))
+        self.assertEqual(pfba._wt_bounds(solver_kwargs={'constraints': {'EX_glc__D_e': (0, 0)}}), (0.0, 0.0))
+
+        lb, ub = pfba._wt_bounds(solver_kwargs={'get_values': True, 'constraints': {}})
+        self.assertAlmostEqual(lb, 0.8739, places=3)
+        self.assertEqual(lb, ub)
+        self.assertEqual(pfba._wt_bounds(), (lb, ub))
+        self.assertEqual(pfba._wt_bounds(solver_kwargs={'minimize': True}), (0.0, 0.0))
+
+        pfba_sol = pfba.optimize()
+        self.assertAlmostEqual(pfba_sol.objective_value, 518.422, places=2)
+        self.assertAlmostEqual(pfba_sol.x['Biomass_Ecoli_core'], 0.8739, places=3)
+
+    def test_n_jobs(self):
+        """
+        Tests that the analysis methods return the same results in the same order with one or multiple threads
+        """
+        import numpy as np
+        from mewpy.germ.analysis import fva, single_gene_deletion, single_reaction_deletion, ifva
+
+        reactions = list(self.model.reactions.keys())[:20]
+        genes = list(self.model.genes.keys())[:20]
+
+        for method, kwargs in ((fva, {'reactions': reactions}),
+                               (single_gene_deletion, {'genes': genes}),
+                               (single_reaction_deletion, {'reactions': reactions})):
+            serial = method(model=self.model, n_jobs=1, **kwargs)
+            threaded = method(model=self.model, n_jobs=3, **kwargs)
+
+            items = next(iter(kwargs.values()))
+            self.assertEqual(list(serial.index), items)
+            self.assertEqual(list(threaded.index), items)
+            self.assertEqual(list(serial.columns), list(threaded.columns))
+
+            for column in serial.columns:
+                if serial[column].dtype == object:
+                    self.assertEqual(list(serial[column]), list(threaded[column]))
+                else:
+                    self.assertTrue(np.allclose(serial[column], threaded[column], atol=1e-6))
+
+        from mewpy.io import Reader, Engines, read_model
+        model = read_model(Reader(Engines.BooleanRegulatoryCSV, SAMPLE_REG_MODEL, sep=',', id_col=0, rule_col=1),
+                           Reader(Engines.MetabolicSBML, SAMPLE_MODEL))
+        model.objective = {'r11': 1}
+
+        reactions = list(model.reactions.keys())
+        serial = ifva(model, reactions=reactions, n_jobs=1)
+        threaded = ifva(model, reactions=reactions, n_jobs=3)
+        self.assertEqual(list(serial.index), reactions)
+        self.assertEqual(list(threaded.index), reactions)
+        self.assertTrue(np.allclose(serial.to_numpy(), threaded.to_numpy(), atol=1e-6))
+
+    def test_gpr_clauses(self):
+        """
+        Tests the expansion of GPR rules into clauses against the evaluation of the rules
+        """
+        import itertools
+        from mewpy.germ.algebra import Expression, parse_expression, And, Or, Symbol, BoolTrue, BoolFalse
+        from mewpy.germ.variables import Gene
+        from mewpy.germ.analysis.metabolic_analysis import _gpr_clauses
+
+        rules = [parse_expression('a and (b or (c and d)) or e'),
+                 parse_expression('(a or b) and (c or (d and (e or f)))'),
+                 parse_expression('a and true'),
+                 parse_expression('(a or false) and b'),
+                 parse_expression('true'),
+                 parse_expression('false'),
+                 Or(variables=[And(variables=[Symbol(value='a'), BoolTrue()]), BoolFalse()]),
+                 BoolTrue(),
+                 BoolFalse()]
+
+        for symbolic in rules:
+            genes = sorted(symbol.name for symbol in symbolic.atoms(symbols_only=True))
+            gpr = Expression(symbolic, {gene: Gene(gene) for gene in genes})
+
+            clauses = _gpr_clauses(symbolic)
+            self.assertIsNotNone(clauses)
+
+            for values in itertools.product((0, 1), repeat=len(genes)):
+                state = dict(zip(genes, values))
+                expected = bool(gpr.evaluate(values=state))
+                active = any(all(state[gene] for gene in clause) for clause in clauses)
+                self.assertEqual(active, expected, f'{symbolic} {state}')
+
+            # knockout effect: with all genes active, all clauses are active and a gene knockout switches off
+            # the rule if the gene belongs to all clauses. A rule without clauses is always switched off
+            for gene in genes:
+                state = {other: 1 for other in genes}
+                state[gene] = 0
+                expected = bool(gpr.evaluate(values=state))
+                switched_off = all(gene in clause for clause in clauses)
+                self.assertEqual(not switched_off, expected, f'{symbolic} ko {gene}')
+
+        # the expansion is given up beyond the clause limit
+        rule = parse_expression(' and '.join(f'(a{i} or b{i})' for i in range(9)))
+        self.assertIsNone(_gpr_clauses(rule))
+        self.assertEqual(len(_gpr_clauses(rule, max_clauses=512)), 512)
+        self.assertIsNone(_gpr_clauses(parse_expression('a or (b and c)'), max_clauses=1))
+        self.assertIsNone(_gpr_clauses(parse_expression('not a')))
+
+    def test_gene_deletion_gpr(self):
+        """
+        Tests the gene deletion using GPR clauses against the direct evaluation of the GPR rules
+        """
+        from unittest import mock
+        import numpy as np
+        from mewpy.germ.analysis import FBA, single_gene_deletion
+        from mewpy.germ.analysis import metabolic_analysis
+
+        genes = list(self.model.genes.keys())
+        result = single_gene_deletion(self.model, genes=genes)
+
+        # the rules cannot be expanded, so that all rules are evaluated for each knockout
+        with mock.patch.object(metabolic_analysis, '_gpr_clauses', return_value=None):
+            fallback = single_gene_deletion(self.model, genes=genes)
+
+        self.assertTrue(np.allclose(result['growth'], fallback['growth'], atol=1e-6))
+
+        fba = FBA(self.model).build()
+        for gene_id in genes[:10]:
+            gene = self.model.genes[gene_id]
+            state = {other: 1 for other in self.model.genes}
+            state[gene_id] = 0
+
+            constraints = {reaction.id: (0.0, 0.0) for reaction in gene.yield_reactions()
+                           if not reaction.gpr.evaluate(values=state)}
+
+            solution = fba.optimize(solver_kwargs={'constraints': constraints})
+            self.assertAlmostEqual(result.loc[gene_id, 'growth'], solution.objective_value or 0.0, places=6)
+
+    def test_prom_bounds(self):
+        """
+        Tests that PROM uses the reaction bounds of the linear problem
+        """
+        from mewpy.io import Reader, Engines, read_model
+        from mewpy.germ.analysis import PROM
+
+        model = read_model(Reader(Engines.BooleanRegulatoryCSV, SAMPLE_REG_MODEL, sep=',', id_col=0, rule_col=1),
+                           Reader(Engines.MetabolicSBML, SAMPLE_MODEL))
+        model.objective = {'r11': 1}
+
+        probabilities = {('g29', 'g10'): 0.1, ('g30', 'g10'): 0.9, ('g35', 'g34'): 0.1}
+        regulators = ['g29', 'g30', 'g35']
+
+        def objectives(problem, n_jobs=1):
+            solution = problem.optimize(initial_state=probabilities, regulators=regulators, n_jobs=n_jobs)
+            return [round(solution.solutions[f'ko_{regulator}'].objective_value, 3) for regulator in regulators]
+
+        prom = PROM(model).build()
+        attached_prom = PROM(model, attach=True).build()
+        self.assertEqual(objectives(prom), [333.333] * 3)
+
+        with model:
+            model.get('r11').bounds = (0, 100)
+
+            # the bounds of the linear problem are used until it is built again,
+            # also by the linear problems of the threads
+            self.assertEqual(objectives(prom), [333.333] * 3)
+            self.assertEqual(objectives(prom, n_jobs=2), [333.333] * 3)
+
+            # attached linear problems are built again upon model changes
+            self.assertEqual(objectives(attached_prom), [100.0] * 3)
+
+            prom.build()
+            self.assertEqual(objectives(prom), [100.0] * 3)
+            self.assertEqual(objectives(prom, n_jobs=2), [100.0] * 3)
+
+        self.assertEqual(objectives(attached_prom), [333.333] * 3)
+
+    @staticmethod
+    def _prom_expression():
+        """
+        It builds a regulatory-metabolic model and an expression data set, in which the expression of the targets
+        depends on the state of their regulators
+        """
+        import numpy as np
+        import pandas as pd
+        from mewpy.io import Reader, Engines, read_model
+
+        model = read_model(Reader(Engines.BooleanRegulatoryCSV, SAMPLE_REG_MODEL, sep=',', id_col=0, rule_col=1),
+                           Reader(Engines.MetabolicSBML, SAMPLE_MODEL))
+
+        rng = np.random.default_rng(0)
+        samples = [f'sample_{i}' for i in range(30)]
+
+        binary = {regulator: rng.integers(0, 2, len(samples)) for regulator in model.regulators}
+
+        expression = {}
+        for interaction in model.yield_interactions():
+            values = rng.normal(0, 0.3, len(samples))
+            for regulator in interaction.regulators:
+                values += binary[regulator]
+            expression[interaction.target.id] = values
+
+        for regulator, values in binary.items():
+            expression.setdefault(regulator, values + rng.normal(0, 0.3, len(samples)))
+
+        expression = pd.DataFrame(expression, index=samples).T
+        binary_expression = (expression.gt(expression.median(axis=1), axis=0)).astype(int)
+        for regulator, values in binary.items():
+            binary_expression.loc[regulator] = values
+
+        return model, expression, binary_expression
+
+    def test_prom_probability_columns(self):
+        """
+        Tests that the samples of the expression matrices are paired by label
+        """
+        from scipy.stats import ks_2samp
+        from mewpy.germ.analysis import target_regulator_interaction_probability
+
+        model, expression, binary_expression = self._prom_expression()
+
+        probabilities, missed = target_regulator_interaction_probability(model, expression, binary_expression)
+        self.assertTrue(any(value == 0 for value in missed.values()))
+
+        # reference computed with label-based masks
+        for (target, regulator), probability in probabilities.items():
+            if target == regulator or target not in expression.index or regulator not in expression.index:
+                continue
+
+            regulator_binary = binary_expression.loc[regulator]
+            target_expression = expression.loc[target]
+            _, p_val = ks_2samp(target_expression[regulator_binary == 1], target_expression[regulator_binary == 0])
+
+            if p_val < 0.05:
+                target_binary = binary_expression.loc[target][regulator_binary == 0]
+                self.assertAlmostEqual(probability, target_binary.sum() / len(target_binary))
+                self.assertEqual(missed[(target, regulator)], 0)
+            else:
+                self.assertEqual(probability, 1)
+                self.assertEqual(missed[(target, regulator)], 1)
+
+        # the columns of the binary expression are shuffled
+        columns = list(binary_expression.columns)
+        shuffled = binary_expression[columns[::2] + columns[1::2]]
+        shuffled_probabilities, shuffled_missed = target_regulator_interaction_probability(model, expression,
+                                                                                          shuffled)
+        self.assertEqual(shuffled_missed, missed)
+        for key, probability in probabilities.items():
+            self.assertAlmostEqual(shuffled_probabilities[key], probability)
+
+        # the samples must be the same
+        with self.assertRaises(ValueError):
+            target_regulator_interaction_probability(model, expression,
+                                                     binary_expression.rename(columns={columns[0]: 'other'}))
+
+    def test_prom_ks_statistics(self):
+        """
+        Tests the KS statistics of PROM against scipy, including ties and constant regulators
+        """
+        import warnings
+        import numpy as np
+        from scipy.stats import ks_2samp
+        from mewpy.germ.analysis.prom import _ks_statistics
+
+        rng = np.random.default_rng(0)
+
+        for _ in range(30):
+            n = int(rng.integers(5, 40))
+            # integer values have many ties
+            values = rng.integers(0, 5, n).astype(float)
+
+            samples_1 = rng.integers(0, 2, (6, n)).astype(bool)
+            # constant regulators
+            samples_1[0] = True
+            samples_1[1] = False
+            samples_0 = ~samples_1
+
+            statistics = _ks_statistics(values, samples_1, samples_0)
+
+            p_values = {}
+            for sample_1, sample_0, (n_1, n_0, statistic) in zip(samples_1, samples_0, statistics):
+                self.assertEqual(n_1, sample_1.sum())
+                self.assertEqual(n_0, sample_0.sum())
+
+                if n_1 == 0 or n_0 == 0:
+                    self.assertEqual(statistic, 0)
+                    continue
+
+                expected = ks_2samp(values[sample_1], values[sample_0])
+                self.assertAlmostEqual(statistic / (n_1 * n_0), expected.statistic)
+
+                # the p-value only depends on the sample sizes and the statistic
+                p_value = p_values.setdefault((n_1, n_0, statistic), expected.pvalue)
+                self.assertAlmostEqual(p_value, expected.pvalue)
+
+        # constant regulators are not significant, as scipy does not return a p-value for an empty sample
+        from mewpy.germ.analysis import target_regulator_interaction_probability
+        model, expression, binary_expression = self._prom_expression()
+        regulator = next(iter(model.regulators))
+        binary_expression.loc[regulator] = 1
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            probabilities, missed = target_regulator_interaction_probability(model, expression, binary_expression)
+
+        for interaction in model.yield_interactions():
+            if regulator in interaction.regulators:
+                self.assertEqual(missed[(interaction.target.id, regulator)], 1)
+                self.assertEqual(probabilities[(interaction.target.id, regulator)], 1)
+
+    def test_predict_gene_expression_cache(self):
+        """
+        It tests that the gene expression regression models are reused for the same training data
+        """
+        from unittest import mock
+        from mewpy.germ.analysis import coregflux, predict_gene_expression
+
+        model, expression, _ = self._prom_expression()
+        influence = expression.loc[list(model.regulators)]
+        experiments = influence.iloc[:, :5]
+
+        with mock.patch.object(coregflux, '_fit_gene_expression', wraps=coregflux._fit_gene_expression) as fit:
+            first = predict_gene_expression(model, influence, expression, experiments)
+            second = predict_gene_expression(model, influence, expression, experiments.iloc[:, 2:])
+            self.assertEqual(fit.call_count, 1)
+            self.assertTrue(first.iloc[:, 2:].equals(second))
+
+            # the fits are cached by the contents of the training data, not by the data frames
+            predict_gene_expression(model, influence.copy(), expression.copy(), experiments)
+            self.assertEqual(fit.call_count, 1)
+
+            # training data changed in place is fitted again
+            target = next(gene for gene in expression.index if gene not in influence.index)
+            expression.loc[target, expression.columns[0]] += 1
+            third = predict_gene_expression(model, influence, expression, experiments)
+            self.assertEqual(fit.call_count, 2)
+            self.assertFalse(first.equals(third))
+
+            # so are training data frames with other labels
+            predict_gene_expression(model, influence.iloc[:, 1:], expression.iloc[:, 1:], experiments)
+            self.assertEqual(fit.call_count, 3)
+
+        self.assertLessEqual(len(coregflux._FITS_CACHE), coregflux._FITS_CACHE_SIZE)
+
+    def test_coregflux_trajectories(self):
+        """
+        It tests that the CoRegFlux conditions are simulated as with one optimization per condition
+        """
+        from mewpy.io import Reader, Engines, read_model
+        from mewpy.germ.analysis import CoRegFlux
+
+        model = read_model(Reader(Engines.BooleanRegulatoryCSV, SAMPLE_REG_MODEL, sep=',', id_col=0, rule_col=1),
+                           Reader(Engines.MetabolicSBML, SAMPLE_MODEL))
+        model.objective = {'r11': 1}
+
+        states = [{'g10': 2, 'g11': 2.3, 'g12': 2.3, 'g34': 0.8},
+                  {'g10': 0.1, 'g11': 0.2, 'g12': 2.3, 'g34': 0.8},
+                  {'g10': 2, 'g11': 0.01, 'g12': 0.01, 'g34': 0.01},
+                  {}]
+
+        def values(solution):
+            return solution.objective_value, solution.x
+
+        def assert_values(solutions, expected_values):
+            # the reused linear problem is warm started, so the values match up to the solver tolerance
+            self.assertEqual(len(solutions), len(expected_values))
+            for (objective, x), (expected_objective, expected_x) in zip(solutions, expected_values):
+                self.assertAlmostEqual(objective, expected_objective, places=6)
+                self.assertEqual(x.keys(), expected_x.keys())
+                for variable, value in x.items():
+                    self.assertAlmostEqual(value, expected_x[variable], places=6)
+
+        expected = [values(CoRegFlux(model).build().optimize(initial_state=state)) for state in states]
+
+        simulator = CoRegFlux(model).build()
+        for n_jobs in (1, 3):
+            solutions = simulator.optimize_trajectories(states, n_jobs=n_jobs)
+            assert_values([values(solution) for solution in solutions], expected)
+
+        # dynamic conditions
+        trajectories = [[states[0], states[1]], [states[2], states[0]], [states[1], states[2]]]
+        time_steps = [0.1, 0.2]
+
+        def dynamic_values(solution):
+            return [values(solution.solutions[f't_{time_step}']) for time_step in time_steps]
+
+        expected = [dynamic_values(CoRegFlux(model).build().optimize(initial_state=trajectory,
+                                                                     time_steps=time_steps))
+                    for trajectory in trajectories]
+
+        for n_jobs in (1, 2):
+            solutions = simulator.optimize_trajectories(trajectories, time_steps=time_steps, n_jobs=n_jobs)
+            assert_values([value for solution in solutions for value in dynamic_values(solution)],
+                          [value for trajectory in expected for value in trajectory])
+
+
 if __name__ == '__main__':
     unittest.main()
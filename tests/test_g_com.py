@@ -54,3 +54,75 @@ class TestCommCobra(TestCommReframed):
         model3.id = 'm3'
         self.models = [model1, model2, model3]
         self.comm = CommunityModel(self.models)
+
+
+class TestBinarySearch(unittest.TestCase):
+
+    def setUp(self):
+        """Set up
+        A mocked solver that is feasible up to a maximum growth rate
+        """
+        from unittest import mock
+        from mewpy.solvers.solution import Solution, Status
+
+        self.max_growth = 0.37
+        self.growths = []
+
+        def solve(objective, minimize=False, constraints=None, get_values=True):
+            growth = self.growths[-1]
+            if growth <= self.max_growth:
+                return Solution(status=Status.OPTIMAL, fobj=growth, values={'growth': growth} if get_values else None)
+            return Solution(status=Status.INFEASIBLE)
+
+        self.solver = mock.Mock()
+        self.solver.update_growth.side_effect = self.growths.append
+        self.solver.solve.side_effect = solve
+
+    def test_growth_rate(self):
+        from mewpy.com.steadycom import binary_search
+
+        sol = binary_search(self.solver, {'growth': 1}, abs_tol=1e-3)
+        self.assertLessEqual(sol.fobj, self.max_growth)
+        self.assertLess(self.max_growth - sol.fobj, 1e-3)
+        self.assertEqual(self.growths[-1], sol.fobj)
+
+        # the growth rate is doubled until it is infeasible before bisecting
+        self.max_growth = 5.3
+        self.growths.clear()
+        sol = binary_search(self.solver, {'growth': 1}, abs_tol=1e-3)
+        self.assertEqual(self.growths[:5], [1, 2, 4, 8, 6])
+        self.assertLess(self.max_growth - sol.fobj, 1e-3)
+
+        # the final solve uses a fraction of the maximum growth rate
+        self.growths.clear()
+        binary_search(self.solver, {'growth': 1}, obj_frac=0.5, abs_tol=1e-3)
+        self.assertAlmostEqual(self.growths[-1], 0.5 * self.growths[-2], delta=1e-3)
+        self.assertLess(self.max_growth - 2 * self.growths[-1], 1e-3)
+
+    def test_relative_tolerance(self):
+        import warnings
+        from mewpy.com.steadycom import binary_search
+
+        self.max_growth = 100.3
+        sol = binary_search(self.solver, {'growth': 1}, abs_tol=1e-3)
+        abs_solves = self.solver.solve.call_count
+
+        self.solver.solve.reset_mock()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            rel_sol = binary_search(self.solver, {'growth': 1}, abs_tol=1e-3, rel_tol=1e-2)
+
+        self.assertLess(self.solver.solve.call_count, abs_solves)
+        self.assertLessEqual(rel_sol.fobj, sol.fobj)
+        self.assertLess(self.max_growth - rel_sol.fobj, 1e-2 * rel_sol.fobj)
+
+    def test_max_iterations(self):
+        from mewpy.com.steadycom import binary_search
+
+        with self.assertWarns(UserWarning):
+            sol = binary_search(self.solver, {'growth': 1}, max_iters=5, abs_tol=1e-3)
+
+        # five feasibility solves and the final solve at the last feasible growth rate
+        self.assertEqual(self.solver.solve.call_count, 6)
+        self.assertEqual(self.growths, [1, 0.5, 0.25, 0.375, 0.3125, 0.3125])
+        self.assertEqual(sol.fobj, 0.3125)